@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-batch event lookups with and without the events indexes.
+
+Seeds a throwaway SQLite database with N events spread over a fixed number of
+batches, then times the queries behind GET /batch/{batch_id} and
+GET /batch/{batch_id}/events before and after building the indexes.
+
+Usage:
+    python benchmarks/bench_event_indexes.py --sizes 1000000,10000000,50000000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORK_DIR = tempfile.mkdtemp(prefix="puretrace-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from db import Base  # noqa: E402
+from models.database import Event  # noqa: E402
+from utils import uuid7  # noqa: E402
+
+EVENT_TYPES = ["Harvest", "Processing", "Quality Check", "Packaging", "Shipping", "Storage", "Retail"]
+
+LOOKUP_QUERIES = {
+    "events_by_batch": "SELECT * FROM events WHERE batch_id = :batch_id ORDER BY timestamp",
+    "batch_with_events": (
+        "SELECT * FROM batches LEFT OUTER JOIN events ON batches.id = events.batch_id "
+        "WHERE batches.id = :batch_id"
+    ),
+}
+
+def seed(engine, n_events: int, n_batches: int, chunk: int = 50_000):
+    """Insert n_batches batches and n_events events with raw executemany."""
+    rng = random.Random(42)
+    # Keys are stored as 16-byte blobs on SQLite, as BinaryUUID writes them
+    batch_ids = [uuid7().bytes for _ in range(n_batches)]
+    start_day = date(2024, 1, 1)
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.executemany(
+            "INSERT INTO batches (id, product_name, origin, harvest_date) VALUES (?, ?, ?, ?)",
+            [(bid, "Benchmark Apples", "Bench Farm", start_day.isoformat()) for bid in batch_ids],
+        )
+        remaining = n_events
+        while remaining:
+            size = min(chunk, remaining)
+            rows = []
+            for _ in range(size):
+                day = start_day + timedelta(days=rng.randrange(365))
+                rows.append((
+                    uuid7().bytes,
+                    batch_ids[rng.randrange(n_batches)],
+                    EVENT_TYPES[rng.randrange(len(EVENT_TYPES))],
+                    "benchmark event",
+                    day.isoformat(),
+                    "Bench Site",
+                    f"{day.isoformat()} 12:00:00",
+                ))
+            cur.executemany(
+                "INSERT INTO events (id, batch_id, event_type, description, timestamp, location, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            raw.commit()
+            remaining -= size
+    finally:
+        raw.close()
+    return batch_ids
+
+def time_lookups(engine, batch_ids, samples: int):
+    """Return latency percentiles in milliseconds for each lookup query."""
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in LOOKUP_QUERIES.items():
+            timings = []
+            for batch_id in random.Random(7).sample(batch_ids, min(samples, len(batch_ids))):
+                start = time.perf_counter()
+                conn.execute(text(sql), {"batch_id": batch_id}).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            results[name] = {
+                "p50_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+                "max_ms": round(timings[-1], 3),
+            }
+    return results
+
+def run(n_events: int, n_batches: int, samples: int):
+    path = os.path.join(WORK_DIR, f"events_{n_events}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    # Create tables without the event indexes to measure the unindexed baseline
+    indexes = list(Event.__table__.indexes)
+    Event.__table__.indexes.clear()
+    try:
+        Base.metadata.create_all(bind=engine)
+    finally:
+        Event.__table__.indexes.update(indexes)
+
+    start = time.perf_counter()
+    batch_ids = seed(engine, n_events, n_batches)
+    seed_seconds = time.perf_counter() - start
+
+    without = time_lookups(engine, batch_ids, samples)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(bind=conn)
+    index_seconds = time.perf_counter() - start
+    with_indexes = time_lookups(engine, batch_ids, samples)
+
+    engine.dispose()
+    os.remove(path)
+    return {
+        "events": n_events,
+        "batches": n_batches,
+        "seed_seconds": round(seed_seconds, 2),
+        "index_build_seconds": round(index_seconds, 2),
+        "without_indexes": without,
+        "with_indexes": with_indexes,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000000,10000000,50000000", help="Comma-separated event counts")
+    parser.add_argument("--batches", type=int, default=100_000, help="Number of batches to spread events over")
+    parser.add_argument("--samples", type=int, default=50, help="Lookups timed per query")
+    args = parser.parse_args()
+
+    try:
+        report = [run(int(size), args.batches, args.samples) for size in args.sizes.split(",")]
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the response models in models/batch.py.
+
+Compares the previous model definitions (v1-style @validator(pre=True) hooks
+and class Config, reproduced below) with the current Pydantic v2 models:
+validating events from ORM-like attribute objects, serializing them to JSON,
+and doing both for a whole event list through a TypeAdapter, where the legacy
+path builds the adapter per call as a per-request helper would.
+
+Usage:
+    python benchmarks/bench_models.py --events 1000 --repeat 50
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List, Union
+from uuid import UUID
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from pydantic import BaseModel, Field, TypeAdapter, validator  # noqa: E402
+
+from models.batch import BatchEvent, BatchEventList  # noqa: E402
+from utils import uuid7  # noqa: E402
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+
+    class LegacyBatchEvent(BaseModel):
+        id: Union[str, UUID] = Field(..., description="Unique identifier for the event")
+        event_type: str = Field(..., description="Type of event")
+        description: str = Field(..., description="Description of the event")
+        timestamp: date = Field(..., description="Timestamp of the event")
+        location: str = Field(..., description="Location where the event occurred")
+        batch_id: Union[str, UUID] = Field(..., description="ID of the batch this event belongs to")
+        created_at: datetime = Field(..., description="When the event was recorded")
+
+        @validator('id', 'batch_id', pre=True)
+        def convert_uuid_to_str(cls, v):
+            if isinstance(v, UUID):
+                return str(v)
+            return v
+
+        class Config:
+            from_attributes = True
+
+def make_events(n: int) -> list:
+    batch_id = uuid7()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid7(),
+            event_type="Processing",
+            description=f"Step {i} recorded at the packing house",
+            timestamp=(start + timedelta(hours=i)).date(),
+            location="Warehouse 4",
+            batch_id=batch_id,
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+def legacy_list(events) -> bytes:
+    adapter = TypeAdapter(List[LegacyBatchEvent])
+    return adapter.dump_json(adapter.validate_python(events, from_attributes=True))
+
+def current_list(events) -> bytes:
+    return BatchEventList.dump_json(BatchEventList.validate_python(events, from_attributes=True))
+
+def rate(fn, n_items: int, repeat: int) -> int:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(n_items / statistics.median(timings))
+
+def run(model, list_fn, events, repeat: int) -> dict:
+    validated = [model.model_validate(event) for event in events]
+    return {
+        "validate_per_sec": rate(lambda: [model.model_validate(event) for event in events], len(events), repeat),
+        "serialize_per_sec": rate(lambda: [item.model_dump_json() for item in validated], len(events), repeat),
+        "list_round_trip_per_sec": rate(lambda: list_fn(events), len(events), repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000, help="Events per timed run")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per measurement")
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    assert legacy_list(events) == current_list(events)
+    report = {
+        "events": args.events,
+        "v1_style": run(LegacyBatchEvent, legacy_list, events, args.repeat),
+        "v2_native": run(BatchEvent, current_list, events, args.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
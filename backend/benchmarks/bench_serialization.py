@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization for batch traces.
+
+Seeds a throwaway SQLite database with one batch per requested size, then
+times building the GET /batch/{batch_id} body two ways: loading ORM objects
+and dumping them through the Pydantic Batch model, and the orjson row-tuple
+path in serializers.py. Query time is included in both; events/sec counts
+events serialized per second of wall time.
+
+Usage:
+    python benchmarks/bench_serialization.py --sizes 10,100,1000,10000 --repeat 20
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORK_DIR = tempfile.mkdtemp(prefix="puretrace-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from db import Base, SessionLocal, engine  # noqa: E402
+from models.batch import Batch as PydanticBatch  # noqa: E402
+from models.database import Batch, Event  # noqa: E402
+from serializers import batch_with_events_query, serialize_batch  # noqa: E402
+from utils import uuid7  # noqa: E402
+
+EVENT_TYPES = ["Harvested", "Processing", "Quality Check", "Packaging", "Shipping", "Received"]
+
+def seed(db, n_events: int):
+    batch = Batch(product_name=f"Batch {n_events}", origin="Valencia, Spain", harvest_date=date(2024, 1, 1))
+    db.add(batch)
+    db.flush()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db.execute(insert(Event), [
+        {
+            "id": uuid7(),
+            "batch_id": batch.id,
+            "event_type": EVENT_TYPES[i % len(EVENT_TYPES)],
+            "description": f"Step {i} recorded at the packing house",
+            "timestamp": (start + timedelta(hours=i)).date(),
+            "location": "Warehouse 4",
+            "created_at": start + timedelta(seconds=i),
+        }
+        for i in range(n_events)
+    ])
+    db.commit()
+    return batch.id
+
+def pydantic_body(db, batch_id) -> bytes:
+    db.expunge_all()
+    batch = db.execute(
+        select(Batch).options(joinedload(Batch.events)).filter(Batch.id == batch_id)
+    ).unique().scalars().first()
+    return PydanticBatch.model_validate(batch).model_dump_json().encode()
+
+def orjson_body(db, batch_id) -> bytes:
+    return serialize_batch(db.execute(batch_with_events_query(batch_id)).all())
+
+def measure(fn, db, batch_id, n_events: int, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(db, batch_id)
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "median_ms": round(median * 1000, 3),
+        "events_per_sec": round(n_events / median) if n_events else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="Comma-separated events per batch")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per size and path")
+    args = parser.parse_args()
+
+    report = {}
+    try:
+        Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            for n_events in (int(size) for size in args.sizes.split(",")):
+                batch_id = seed(db, n_events)
+                assert pydantic_body(db, batch_id) == orjson_body(db, batch_id)
+                pydantic = measure(pydantic_body, db, batch_id, n_events, args.repeat)
+                fast = measure(orjson_body, db, batch_id, n_events, args.repeat)
+                report[n_events] = {
+                    "pydantic": pydantic,
+                    "orjson_rows": fast,
+                    "speedup": round(pydantic["median_ms"] / fast["median_ms"], 2),
+                }
+    finally:
+        engine.dispose()
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark read/write concurrency on SQLite with and without the connection
+profile from db.py (WAL, synchronous=NORMAL, cache_size, mmap_size,
+busy_timeout, temp_store).
+
+Seeds one migrated database per profile, then runs reader and writer
+processes against it for a fixed time, as separate uvicorn workers would.
+Readers run the GET /batch/{batch_id}/events query; writers make the two
+writes of POST /event (bump the batch version, insert the event) in one
+transaction. Both profiles wait up to the same busy timeout for locks, so the
+difference comes from the journal mode, sync level and caches.
+
+Usage:
+    python benchmarks/bench_sqlite_pragmas.py --readers 4 --writers 2 --duration 5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+READ_SQL = (
+    "SELECT id, event_type, description, timestamp, location, batch_id, created_at FROM events "
+    "WHERE batch_id = ? ORDER BY timestamp DESC, id DESC LIMIT 50"
+)
+BUMP_SQL = "UPDATE batches SET version = version + 1, last_event_at = ? WHERE id = ?"
+INSERT_SQL = (
+    "INSERT INTO events (id, batch_id, event_type, description, timestamp, location, created_at) "
+    "VALUES (?, ?, 'Shipping', 'Benchmark event', '2024-06-01', 'Warehouse', ?)"
+)
+
+def seed(path: str, n_batches: int) -> list:
+    """Migrate and fill a database in SQLite's default (rollback journal) mode."""
+    from sqlalchemy import create_engine
+    from migrations import upgrade
+    from synthetic import write
+    engine = create_engine(f"sqlite:///{path}")
+    upgrade(engine)
+    write(engine, n_batches, mean_events=8, seed=3)
+    with engine.connect() as conn:
+        batch_ids = [row[0] for row in conn.exec_driver_sql("SELECT id FROM batches")]
+    engine.dispose()
+    return batch_ids
+
+def worker(path, role, pragmas, batch_ids, duration, seed_value, results):
+    from db import apply_sqlite_pragmas
+    from utils import uuid7
+    conn = sqlite3.connect(path, timeout=5.0)
+    if pragmas:
+        apply_sqlite_pragmas(conn, pragmas)
+    rng = random.Random(seed_value)
+    timings, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        batch_id = rng.choice(batch_ids)
+        start = time.perf_counter()
+        try:
+            if role == "reader":
+                conn.execute(READ_SQL, (batch_id,)).fetchall()
+            else:
+                now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+                conn.execute(BUMP_SQL, (now, batch_id))
+                conn.execute(INSERT_SQL, (uuid7().bytes, batch_id, now))
+                conn.commit()
+        except sqlite3.OperationalError:
+            # "database is locked" after the busy timeout
+            conn.rollback()
+            errors += 1
+            continue
+        timings.append(time.perf_counter() - start)
+    conn.close()
+    results.put((role, timings, errors))
+
+def summarize(timings, errors, duration):
+    timings = sorted(timings)
+    if not timings:
+        return {"ops": 0, "ops_per_sec": 0, "errors": errors}
+    return {
+        "ops": len(timings),
+        "ops_per_sec": round(len(timings) / duration),
+        "errors": errors,
+        "p50_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1] * 1000, 3),
+        "p99_ms": round(timings[int(len(timings) * 0.99) - 1] * 1000, 3),
+        "max_ms": round(timings[-1] * 1000, 3),
+    }
+
+def run(path: str, pragmas, batch_ids, readers: int, writers: int, duration: float):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    roles = ["reader"] * readers + ["writer"] * writers
+    processes = [
+        context.Process(target=worker, args=(path, role, pragmas, batch_ids, duration, i, results))
+        for i, role in enumerate(roles)
+    ]
+    for process in processes:
+        process.start()
+    collected = {"reader": ([], 0), "writer": ([], 0)}
+    for _ in processes:
+        role, timings, errors = results.get()
+        all_timings, all_errors = collected[role]
+        collected[role] = (all_timings + timings, all_errors + errors)
+    for process in processes:
+        process.join()
+    return {f"{role}s": summarize(timings, errors, duration) for role, (timings, errors) in collected.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=2000, help="Batches to seed (about 8 events each)")
+    parser.add_argument("--readers", type=int, default=4, help="Reader processes")
+    parser.add_argument("--writers", type=int, default=2, help="Writer processes")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run each profile")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="puretrace-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(work_dir, 'unused.db')}")
+    from db import sqlite_pragmas
+
+    profiles = {"sqlite_defaults": None, "tuned": sqlite_pragmas()}
+    report = {"readers": args.readers, "writers": args.writers, "duration_seconds": args.duration, "profiles": {}}
+    try:
+        for name, pragmas in profiles.items():
+            path = os.path.join(work_dir, f"{name}.db")
+            batch_ids = seed(path, args.batches)
+            report["profiles"][name] = {
+                "pragmas": pragmas,
+                **run(path, pragmas, batch_ids, args.readers, args.writers, args.duration),
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Measure cold start: the time from process start until the API has answered
+its first requests.
+
+Each run starts a fresh interpreter against a migrated, seeded SQLite
+database. The in-process probe reports its own phases: interpreter start
+(from spawn until the probe's first line runs), `import main`, lifespan
+startup, the first and second GET /batches and GET /batch/{id}, and the
+first and second GET /openapi.json. The uvicorn target instead times a real
+`uvicorn main:app` process from spawn until it first answers GET /batches.
+Each phase is reported as a median over the runs; --budget-ms turns the
+time to first response into a pass/fail check.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --runs 5 --targets uvicorn --budget-ms 1500
+    OPENAPI_CACHE_DIR=/tmp/openapi python benchmarks/bench_startup.py
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Runs in a fresh interpreter; PROBE_SPAWNED_AT is the wall clock just before it was spawned
+PROBE = r"""
+import json, os, time
+spawned = float(os.environ["PROBE_SPAWNED_AT"])
+phases = {"interpreter": time.time() - spawned}
+
+def phase(name, fn):
+    start = time.perf_counter()
+    result = fn()
+    phases[name] = time.perf_counter() - start
+    return result
+
+main = phase("import", lambda: __import__("main"))
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+phase("lifespan", client.__enter__)
+batch_id = os.environ["PROBE_BATCH_ID"]
+phase("first_list", lambda: client.get("/batches").raise_for_status())
+phase("first_read", lambda: client.get(f"/batch/{batch_id}").raise_for_status())
+phases["to_first_responses"] = time.time() - spawned
+phase("second_list", lambda: client.get("/batches").raise_for_status())
+phase("second_read", lambda: client.get(f"/batch/{batch_id}").raise_for_status())
+phase("first_openapi", lambda: client.get("/openapi.json").raise_for_status())
+phase("second_openapi", lambda: client.get("/openapi.json").raise_for_status())
+client.__exit__(None, None, None)
+print(json.dumps(phases))
+"""
+
+def prepare() -> str:
+    """Migrate and seed a database, returning the id of a batch with events."""
+    from db import engine
+    from migrations import upgrade
+    from synthetic import write
+    upgrade(engine)
+    write(engine, 200, mean_events=8, seed=1)
+    with engine.connect() as conn:
+        batch_id = conn.exec_driver_sql("SELECT id FROM batches LIMIT 1").scalar()
+    engine.dispose()
+    return str(uuid.UUID(bytes=batch_id))
+
+def probe(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env={**env, "PROBE_SPAWNED_AT": repr(time.time())}, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def uvicorn_first_response(env: dict, timeout: float = 60) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/batches", timeout=1) as response:
+                    response.read()
+                return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.002)
+        raise RuntimeError("uvicorn did not answer in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+def summarize(runs):
+    return {name: round(statistics.median(run[name] for run in runs) * 1000, 1) for name in runs[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes per target")
+    parser.add_argument("--targets", default="probe,uvicorn", help="Comma-separated targets: probe, uvicorn")
+    parser.add_argument("--budget-ms", type=float, help="Exit with status 1 if the median time to first response exceeds this")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="puretrace-startup-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir, 'startup.db')}"
+    env = {
+        **os.environ,
+        "PROBE_BATCH_ID": prepare(),
+        "PYTHONWARNINGS": "ignore",
+    }
+
+    report = {"runs": args.runs}
+    targets = args.targets.split(",")
+    if "probe" in targets:
+        report["probe_ms"] = summarize([probe(env) for _ in range(args.runs)])
+    if "uvicorn" in targets:
+        report["uvicorn_first_response_ms"] = round(
+            statistics.median(uvicorn_first_response(env) for _ in range(args.runs)) * 1000, 1
+        )
+    print(json.dumps(report, indent=2))
+
+    if args.budget_ms is not None:
+        measured = report.get("uvicorn_first_response_ms") or report["probe_ms"]["to_first_responses"]
+        if measured > args.budget_ms:
+            print(f"Startup took {measured} ms, over the {args.budget_ms} ms budget", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
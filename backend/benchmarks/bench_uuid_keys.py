@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark string UUIDv4 keys against binary UUIDv7 keys.
+
+Builds the batches/events schema twice in throwaway SQLite databases, once
+with 36-character string keys filled from uuid4() and once with 16-byte blob
+keys filled from uuid7(), then reports insert throughput, primary-key and
+per-batch lookup latency, and the resulting database size.
+
+Usage:
+    python benchmarks/bench_uuid_keys.py --batches 200000 --events-per-batch 5
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils import uuid7  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE batches (
+    id {key} NOT NULL PRIMARY KEY,
+    product_name VARCHAR NOT NULL,
+    origin VARCHAR NOT NULL,
+    harvest_date DATE NOT NULL
+);
+CREATE TABLE events (
+    id {key} NOT NULL PRIMARY KEY,
+    batch_id {key} NOT NULL REFERENCES batches (id),
+    event_type VARCHAR NOT NULL,
+    timestamp DATE NOT NULL
+);
+CREATE INDEX ix_events_batch_id ON events (batch_id);
+"""
+
+KEY_SCHEMES = {
+    "string_uuid4": ("VARCHAR", lambda: str(uuid.uuid4())),
+    "binary_uuid7": ("BLOB", lambda: uuid7().bytes),
+}
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return {
+        "p50_us": round(statistics.median(timings) * 1e6, 2),
+        "p95_us": round(timings[int(len(timings) * 0.95) - 1] * 1e6, 2),
+    }
+
+def run(scheme: str, n_batches: int, events_per_batch: int, work_dir: str, chunk: int = 10_000):
+    key_type, new_key = KEY_SCHEMES[scheme]
+    path = os.path.join(work_dir, f"{scheme}.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA.format(key=key_type))
+
+    batch_ids = []
+    start = time.perf_counter()
+    for offset in range(0, n_batches, chunk):
+        batches, events = [], []
+        for _ in range(min(chunk, n_batches - offset)):
+            batch_id = new_key()
+            batch_ids.append(batch_id)
+            batches.append((batch_id, "Benchmark Apples", "Bench Farm", "2024-01-01"))
+            events.extend((new_key(), batch_id, "Processing", "2024-01-02") for _ in range(events_per_batch))
+        conn.executemany("INSERT INTO batches VALUES (?, ?, ?, ?)", batches)
+        conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", events)
+        conn.commit()
+    insert_seconds = time.perf_counter() - start
+    rows = n_batches * (events_per_batch + 1)
+
+    sample = random.Random(7).sample(batch_ids, min(2000, len(batch_ids)))
+    pk_timings, events_timings = [], []
+    for batch_id in sample:
+        start = time.perf_counter()
+        conn.execute("SELECT * FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        pk_timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        conn.execute("SELECT * FROM events WHERE batch_id = ?", (batch_id,)).fetchall()
+        events_timings.append(time.perf_counter() - start)
+    conn.close()
+
+    return {
+        "rows": rows,
+        "insert_seconds": round(insert_seconds, 2),
+        "inserts_per_second": round(rows / insert_seconds),
+        "batch_pk_lookup": percentiles(pk_timings),
+        "events_by_batch_lookup": percentiles(events_timings),
+        "database_mb": round(os.path.getsize(path) / 1e6, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=200_000, help="Number of batches to insert")
+    parser.add_argument("--events-per-batch", type=int, default=5, help="Events inserted per batch")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="puretrace-bench-")
+    try:
+        report = {scheme: run(scheme, args.batches, args.events_per_batch, work_dir) for scheme in KEY_SCHEMES}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Load-test the PureTrace API.
+
+Seeds a database with N batches and their events from the synthetic data
+generator (synthetic.py), then drives each workload at each concurrency
+level, first through an in-process ASGI client (no network, measures the app
+itself) and then against a real uvicorn server started as a subprocess.
+Target batches are drawn from a Zipfian hot set (--zipf 0 for uniform). Reports p50/p95/p99 latency, throughput and error
+counts as JSON, so runs can be stored and compared over time.
+
+Workloads:
+    create_batch  POST /batch
+    create_event  POST /event on a seeded batch
+    read          GET /batch/{batch_id}
+    read_events   GET /batch/{batch_id}/events?limit=50
+    list          GET /batches?limit=50
+
+Uses a throwaway SQLite database unless --database-url is given (for example
+a PostgreSQL URL; pending migrations are applied first).
+
+Usage:
+    python benchmarks/loadtest.py --batches 1000 --mean-events 8 \\
+        --concurrency 1,10,50 --requests 2000 --output loadtest.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from synthetic import DESCRIPTIONS, ZipfSampler, write  # noqa: E402
+
+WORKLOADS = ["create_batch", "create_event", "read", "read_events", "list"]
+TARGETS = ["asgi", "uvicorn"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Database to seed and test (default: throwaway SQLite file)")
+    parser.add_argument("--batches", type=int, default=1000, help="Batches to seed")
+    parser.add_argument("--mean-events", type=float, default=8, help="Mean events seeded per batch (log-normal)")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the rows already in --database-url")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="Comma-separated workloads to run")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated targets: asgi, uvicorn")
+    parser.add_argument("--concurrency", default="1,10,50", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per workload and concurrency level")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed requests before each measurement")
+    parser.add_argument("--port", type=int, default=0, help="Port for the uvicorn target (default: a free port)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for picking batches (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the data and request targets")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+def existing_batch_ids(limit: int = 100_000):
+    from sqlalchemy import select
+    from db import engine
+    from models.database import Batch
+
+    with engine.connect() as conn:
+        return list(conn.execute(select(Batch.id).limit(limit)).scalars())
+
+def make_request(workload: str, pick, rng: random.Random):
+    """Return (method, path, json body) for one request of a workload; pick() chooses the target batch."""
+    if workload == "create_batch":
+        return "POST", "/batch", {"product_name": "Load Test Pears", "origin": "Bench Farm", "harvest_date": "2024-01-01"}
+    if workload == "create_event":
+        return "POST", "/event", {
+            "batch_id": str(pick()),
+            "event_type": rng.choice(list(DESCRIPTIONS)),
+            "description": "load test event",
+            "timestamp": "2024-06-01",
+            "location": "Bench Site",
+        }
+    if workload == "read":
+        return "GET", f"/batch/{pick()}", None
+    if workload == "read_events":
+        return "GET", f"/batch/{pick()}/events?limit=50", None
+    if workload == "list":
+        return "GET", "/batches?limit=50", None
+    raise ValueError(f"Unknown workload: '{workload}'")
+
+def summarize(latencies, errors: int, elapsed: float) -> dict:
+    latencies.sort()
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+async def drive(client, workload: str, pick, n_requests: int, concurrency: int, rng: random.Random) -> dict:
+    """Send n_requests from `concurrency` workers sharing one request budget."""
+    latencies = []
+    errors = 0
+    remaining = n_requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, path, body = make_request(workload, pick, rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+async def run_target(client, args, batch_ids) -> dict:
+    rng = random.Random(args.seed)
+    # Reads and event writes concentrate on a hot set of batches, as on a live trace site
+    pick = ZipfSampler(batch_ids, args.zipf, args.seed).sample if args.zipf > 0 else lambda: rng.choice(batch_ids)
+    results = {}
+    for workload in args.workloads.split(","):
+        results[workload] = {}
+        for concurrency in (int(level) for level in args.concurrency.split(",")):
+            if args.warmup:
+                await drive(client, workload, pick, args.warmup, concurrency, rng)
+            results[workload][concurrency] = await drive(client, workload, pick, args.requests, concurrency, rng)
+    return results
+
+async def run_asgi(args, batch_ids) -> dict:
+    import httpx
+    from main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest") as client:
+        return await run_target(client, args, batch_ids)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def run_uvicorn(args, batch_ids) -> dict:
+    import httpx
+
+    port = args.port or free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    max_concurrency = max(int(level) for level in args.concurrency.split(","))
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    await client.get("/metrics")
+                    break
+                except httpx.TransportError:
+                    if server.poll() is not None or time.monotonic() > deadline:
+                        raise RuntimeError("uvicorn did not start")
+                    await asyncio.sleep(0.1)
+            return await run_target(client, args, batch_ids)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+def main():
+    args = parse_args()
+    work_dir = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        work_dir = tempfile.mkdtemp(prefix="puretrace-loadtest-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir, 'loadtest.db')}"
+
+    try:
+        from db import engine
+        from migrations import upgrade
+        upgrade(engine)
+
+        start = time.perf_counter()
+        if args.skip_seed:
+            batch_ids, n_events = existing_batch_ids(), None
+        else:
+            batch_ids, n_events = write(engine, args.batches, mean_events=args.mean_events, seed=args.seed)
+        seed_seconds = time.perf_counter() - start
+        if not batch_ids:
+            raise SystemExit("No batches to test against; run without --skip-seed")
+
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": engine.url.get_backend_name(),
+            "config": {
+                "batches": len(batch_ids),
+                "events": n_events,
+                "zipf": args.zipf,
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "seed": args.seed,
+            },
+            "seed_seconds": None if args.skip_seed else round(seed_seconds, 2),
+            "results": {},
+        }
+        runners = {"asgi": run_asgi, "uvicorn": run_uvicorn}
+        for target in args.targets.split(","):
+            report["results"][target] = asyncio.run(runners[target](args, batch_ids))
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Generate realistic synthetic supply-chain data for benchmarks and capacity planning.
+
+Writes batches and events into the Batch/Event models' tables in chunks, with
+COPY on PostgreSQL, pre-encoded executemany on SQLite, or portable SQLAlchemy
+bulk inserts. Output is deterministic for a given seed: the same IDs,
+timestamps and event sequences are produced on every run.
+
+Distributions:
+    - events per batch are log-normal (most batches have a handful of events,
+      a long tail has hundreds), clipped to [1, --max-events]
+    - event types follow the supply-chain flow used by test_complete_app.py,
+      e.g. Processing -> Quality Check -> Packaging -> Shipping -> Received
+    - batch creation times are spread over --days, events follow the harvest
+      in order, hours to days apart
+    - ZipfSampler picks batches with a Zipfian hot set, for driving reads
+
+Usage:
+    python benchmarks/synthetic.py --database-url sqlite:///./synthetic.db --batches 1000000 --mean-events 8
+    python benchmarks/synthetic.py --database-url postgresql://localhost/puretrace --batches 1000000 --method raw
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Start of the synthetic timeline; fixed so runs are reproducible
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+PRODUCTS = [
+    "Organic Apples", "Pears", "Cherries", "Blueberries", "Strawberries", "Avocados",
+    "Tomatoes", "Coffee Beans", "Cocoa Beans", "Olive Oil", "Honey", "Wheat",
+]
+ORIGINS = [
+    "Test Valley Farm, Oregon", "Yakima Valley, Washington", "Valencia, Spain", "Michoacán, Mexico",
+    "Huila, Colombia", "Ashanti, Ghana", "Crete, Greece", "Canterbury, New Zealand",
+]
+LOCATIONS = {
+    "Processing": ["Processing Center A", "Processing Center Alpha"],
+    "Quality Check": ["Quality Control Lab"],
+    "Packaging": ["Packaging Facility B", "Packaging Facility Beta"],
+    "Storage": ["Cold Storage 1", "Cold Storage 2"],
+    "Shipping": ["Distribution Hub C"],
+    "Transportation": ["Distribution Center Gamma", "Port of Rotterdam"],
+    "Received": ["Retail Warehouse North", "Retail Warehouse South"],
+}
+DESCRIPTIONS = {
+    "Processing": "Washed and sorted by quality",
+    "Quality Check": "Passed quality inspection - Grade A",
+    "Packaging": "Packaged in biodegradable containers",
+    "Storage": "Held in temperature-controlled storage",
+    "Shipping": "Shipped to distribution center",
+    "Transportation": "Moved via refrigerated truck",
+    "Received": "Received at retail warehouse",
+}
+
+# Markov chain over event types: state -> [(next state, probability), ...].
+# Batches with more events than the main flow keep cycling through storage and inspections.
+EVENT_FLOW = {
+    None: [("Processing", 0.9), ("Quality Check", 0.1)],
+    "Processing": [("Quality Check", 0.6), ("Packaging", 0.4)],
+    "Quality Check": [("Packaging", 0.7), ("Processing", 0.1), ("Shipping", 0.2)],
+    "Packaging": [("Storage", 0.3), ("Shipping", 0.7)],
+    "Storage": [("Quality Check", 0.3), ("Shipping", 0.7)],
+    "Shipping": [("Transportation", 0.6), ("Received", 0.4)],
+    "Transportation": [("Received", 0.8), ("Storage", 0.2)],
+    "Received": [("Storage", 0.5), ("Quality Check", 0.5)],
+}
+
+class ZipfSampler:
+    """Pick items with probability proportional to 1 / rank**s, ranks assigned by a seeded shuffle."""
+
+    def __init__(self, items, s: float = 1.1, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.items = list(items)
+        self.rng.shuffle(self.items)
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, len(self.items) + 1)))
+
+    def sample(self):
+        point = self.rng.random() * self.cum_weights[-1]
+        return self.items[bisect_left(self.cum_weights, point)]
+
+def events_for_batch(rng: random.Random, mean: float, sigma: float, max_events: int) -> int:
+    """Draw a log-normal event count with the requested mean."""
+    mu = math.log(mean) - sigma * sigma / 2
+    return max(1, min(max_events, round(rng.lognormvariate(mu, sigma))))
+
+def event_sequence(rng: random.Random, count: int):
+    """Walk EVENT_FLOW for count steps."""
+    state = None
+    sequence = []
+    for _ in range(count):
+        choices, weights = zip(*EVENT_FLOW[state])
+        state = rng.choices(choices, weights)[0]
+        sequence.append(state)
+    return sequence
+
+def rand_bits(rng: random.Random) -> int:
+    return rng.getrandbits(74)
+
+def generate(n_batches: int, mean_events: float = 8, sigma: float = 1.0, max_events: int = 500,
+             days: int = 365, seed: int = 42, chunk: int = 10_000):
+    """Yield (batch_rows, event_rows) chunks of insert-ready dicts."""
+    from utils import uuid7
+
+    rng = random.Random(seed)
+    span_ms = days * 86_400_000
+    # Creation times are sorted up front so IDs and created_at increase together, like live inserts
+    offsets = sorted(rng.randrange(span_ms) for _ in range(n_batches))
+    for start in range(0, n_batches, chunk):
+        batch_rows = []
+        event_rows = []
+        for offset in offsets[start:start + chunk]:
+            created_at = EPOCH + timedelta(milliseconds=offset)
+            batch_id = uuid7(int(created_at.timestamp() * 1000), rand_bits(rng))
+            at = created_at
+            types = event_sequence(rng, events_for_batch(rng, mean_events, sigma, max_events))
+            for event_type in types:
+                at += timedelta(minutes=rng.randrange(30, 3 * 24 * 60))
+                event_rows.append({
+                    "id": uuid7(int(at.timestamp() * 1000), rand_bits(rng)),
+                    "batch_id": batch_id,
+                    "event_type": event_type,
+                    "description": DESCRIPTIONS[event_type],
+                    "timestamp": at.date(),
+                    "location": rng.choice(LOCATIONS[event_type]),
+                    "created_at": at,
+                })
+            batch_rows.append({
+                "id": batch_id,
+                "product_name": rng.choice(PRODUCTS),
+                "origin": rng.choice(ORIGINS),
+                "harvest_date": (created_at - timedelta(days=rng.randrange(4))).date(),
+                "created_at": created_at,
+                "version": len(types),
+                "last_event_at": at,
+            })
+        yield batch_rows, event_rows
+
+def copy_rows(cursor, table, rows):
+    """Stream rows into a PostgreSQL table with COPY ... FROM STDIN (CSV)."""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([value.isoformat() if hasattr(value, "isoformat") else value for value in row.values()])
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def sqlite_value(value):
+    """Encode a value the way the SQLite dialect and BinaryUUID store it."""
+    if isinstance(value, UUID):
+        return value.bytes
+    if isinstance(value, datetime):
+        return f"{value:%Y-%m-%d %H:%M:%S.%f}"
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def sqlite_rows(cursor, table, rows):
+    """executemany straight on the sqlite3 cursor, skipping SQLAlchemy's per-value bind processing."""
+    columns = list(rows[0])
+    cursor.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        [tuple(sqlite_value(value) for value in row.values()) for row in rows],
+    )
+
+# Fastest loader for each dialect, used by --method auto
+RAW_WRITERS = {"postgresql": copy_rows, "sqlite": sqlite_rows}
+
+def write(engine, n_batches: int, method: str = "auto", progress=None, **options):
+    """Generate and store n_batches batches with their events; return the batch IDs and row counts."""
+    from sqlalchemy import insert
+    from models.database import Batch, Event
+
+    if method == "auto":
+        method = "raw" if engine.dialect.name in RAW_WRITERS else "insert"
+    if method == "raw" and engine.dialect.name not in RAW_WRITERS:
+        raise ValueError(f"--method raw is not supported for {engine.dialect.name}")
+    write_rows = RAW_WRITERS.get(engine.dialect.name)
+    batch_ids = []
+    n_events = 0
+    for batch_rows, event_rows in generate(n_batches, **options):
+        if method == "raw":
+            raw = engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                write_rows(cursor, Batch.__tablename__, batch_rows)
+                if event_rows:
+                    write_rows(cursor, Event.__tablename__, event_rows)
+                raw.commit()
+            finally:
+                raw.close()
+        else:
+            # One transaction and one executemany per table and chunk
+            with engine.begin() as conn:
+                conn.execute(insert(Batch), batch_rows)
+                if event_rows:
+                    conn.execute(insert(Event), event_rows)
+        batch_ids.extend(row["id"] for row in batch_rows)
+        n_events += len(event_rows)
+        if progress:
+            progress(len(batch_ids), n_events)
+    return batch_ids, n_events
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Target database (default: DATABASE_URL)")
+    parser.add_argument("--batches", type=int, default=100_000, help="Batches to generate")
+    parser.add_argument("--mean-events", type=float, default=8, help="Mean events per batch")
+    parser.add_argument("--sigma", type=float, default=1.0, help="Log-normal sigma of events per batch (higher = more skew)")
+    parser.add_argument("--max-events", type=int, default=500, help="Upper bound on events per batch")
+    parser.add_argument("--days", type=int, default=365, help="Days over which batches are created")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--chunk", type=int, default=10_000, help="Batches per insert transaction")
+    parser.add_argument(
+        "--method", choices=["auto", "insert", "raw"], default="auto",
+        help="insert: portable SQLAlchemy executemany; raw: COPY on PostgreSQL, driver executemany on SQLite; auto: raw where supported",
+    )
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from db import engine
+    from migrations import upgrade
+    upgrade(engine)
+
+    start = time.perf_counter()
+    _, n_events = write(
+        engine, args.batches, method=args.method,
+        progress=lambda b, e: print(f"{b} batches, {e} events", file=sys.stderr),
+        mean_events=args.mean_events, sigma=args.sigma, max_events=args.max_events,
+        days=args.days, seed=args.seed, chunk=args.chunk,
+    )
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "batches": args.batches,
+        "events": n_events,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round((args.batches + n_events) / elapsed),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
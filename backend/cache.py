@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+from uuid import UUID
+import os
+import threading
+import time
+
+# Response cache settings
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+class CacheStats:
+    """Counters reported for a cache backend under /metrics."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale = 0
+
+    def record_stale(self):
+        """Count a hit whose entry was stored under an outdated validator as a miss."""
+        self.hits -= 1
+        self.misses += 1
+        self.stale += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+class NullCache:
+    """Cache backend that stores nothing, used when CACHE_BACKEND=none."""
+
+    name = "none"
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes):
+        pass
+
+    async def delete(self, key: str):
+        self.stats.invalidations += 1
+
+    def describe(self) -> dict:
+        return {"backend": self.name, **self.stats.as_dict()}
+
+class LRUCache(NullCache):
+    """In-process least-recently-used cache whose entries expire after ttl seconds."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    async def set(self, key: str, value: bytes):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    async def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self.stats.invalidations += 1
+
+    def describe(self) -> dict:
+        return {
+            "backend": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            **self.stats.as_dict(),
+        }
+
+class RedisCache(NullCache):
+    """Cache stored in Redis (or any client exposing async get/set/delete).
+
+    Entries are shared between workers; evictions happen inside Redis and are
+    not counted here.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl: float = CACHE_TTL_SECONDS, prefix: str = "puretrace:"):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes):
+        await self.client.set(self.prefix + key, value, ex=max(int(self.ttl), 1))
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+        self.stats.invalidations += 1
+
+    def describe(self) -> dict:
+        return {"backend": self.name, "ttl_seconds": self.ttl, **self.stats.as_dict()}
+
+def create_cache(backend: str = CACHE_BACKEND):
+    """Build the response cache selected by CACHE_BACKEND (memory, redis or none)."""
+    if backend == "none":
+        return NullCache()
+    if backend == "redis":
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            raise ValueError("CACHE_BACKEND=redis requires the 'redis' package")
+        return RedisCache(redis_asyncio.from_url(REDIS_URL))
+    if backend == "memory":
+        return LRUCache()
+    raise ValueError(f"Unknown CACHE_BACKEND: '{backend}'")
+
+# Shared response cache used by the routes
+_cache = create_cache()
+
+def get_cache():
+    """Return the active response cache."""
+    return _cache
+
+def set_cache(backend):
+    """Replace the active response cache, e.g. with a RedisCache around a local stand-in."""
+    global _cache
+    _cache = backend
+
+def batch_cache_key(batch_id: UUID) -> str:
+    """Cache key for the GET /batch/{batch_id} response body."""
+    return f"batch:{batch_id}"
+
+async def get_validated(cache, key: str, etag: str) -> Optional[bytes]:
+    """Cached body stored under etag; an entry stored under another validator is a miss.
+
+    Checking the validator keeps responses correct when the row changed without
+    this process invalidating its cache (another worker's memory cache, or a
+    write made outside the API).
+    """
+    value = await cache.get(key)
+    if value is None:
+        return None
+    stored_etag, _, body = value.partition(b"\n")
+    if stored_etag != etag.encode():
+        cache.stats.record_stale()
+        return None
+    return body
+
+async def set_validated(cache, key: str, etag: str, body: bytes):
+    """Store body together with the validator it was served under.
+
+    A body loaded before a concurrent write and stored after its invalidation
+    is harmless: its validator no longer matches, so get_validated() skips it.
+    """
+    await cache.set(key, etag.encode() + b"\n" + body)
+
+async def invalidate_batches(batch_ids):
+    """Drop cached responses for batches whose events changed."""
+    for batch_id in set(batch_ids):
+        await _cache.delete(batch_cache_key(batch_id))
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
+from uuid import UUID
+import hashlib
+
+from models.database import Batch as SQLAlchemyBatch
+
+# Let shared caches store trace responses but revalidate them on every request
+CACHE_CONTROL = "public, no-cache"
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that identify a representation."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (as returned by SQLite) as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+# Batch columns the validators are derived from, for queries that fetch them alongside other data
+VALIDATOR_COLUMNS = (SQLAlchemyBatch.created_at, SQLAlchemyBatch.version, SQLAlchemyBatch.last_event_at)
+
+def batch_validators(batch_id: UUID, created_at: datetime, version: int, last_event_at: Optional[datetime]) -> Tuple[str, datetime]:
+    """(ETag, Last-Modified) for a batch from its VALIDATOR_COLUMNS values."""
+    return make_etag(batch_id, created_at, version), as_utc(last_event_at or created_at)
+
+def has_preconditions(request: Request) -> bool:
+    """Whether the request carries validators that could make it a 304."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+async def load_batch_validators(db: AsyncSession, batch_id: UUID) -> Optional[Tuple[str, datetime]]:
+    """Return (ETag, Last-Modified) for a batch from its primary-key row, or None if it does not exist."""
+    result = await db.execute(select(*VALIDATOR_COLUMNS).filter(SQLAlchemyBatch.id == batch_id))
+    row = result.first()
+    if row is None:
+        return None
+    return batch_validators(batch_id, *row)
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Evaluate If-None-Match, then If-Modified-Since, as in RFC 9110."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: a W/ prefix added by an intermediary still matches
+        return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+def validator_headers(etag: str, last_modified: datetime) -> dict:
+    """Headers sent with both full and 304 responses."""
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+def not_modified_response(etag: str, last_modified: datetime) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
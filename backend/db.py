@@ -1,8 +1,16 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from collections import deque
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.orm import Session
+from typing import Dict
+import logging
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,19 +22,309 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("No DATABASE_URL set in environment variables")
 
+# Async drivers used for each sync URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver."""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+# Async Database URL (defaults to DATABASE_URL with an async driver)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+# Connection pool settings (only applied to queue-based pools)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+
+# Slow-query log (disabled unless SLOW_QUERY_MS is set above 0)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+
+# SQLite connection profile, applied to every new connection (SQLITE_TUNING=false keeps SQLite's defaults)
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "true").lower() in ("1", "true", "yes")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+# Page cache shared out between every pooled connection of both engines (pool size + overflow, twice),
+# never below SQLite's own 2000 KiB; SQLITE_CACHE_SIZE overrides it per connection (negative: KiB)
+SQLITE_CACHE_BUDGET_KIB = int(os.getenv("SQLITE_CACHE_BUDGET_KIB", str(64 * 1024)))
+SQLITE_CACHE_SIZE = int(
+    os.getenv("SQLITE_CACHE_SIZE") or -max(SQLITE_CACHE_BUDGET_KIB // (2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)), 2000)
+)
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY").upper()
+
+logger = logging.getLogger("puretrace.db")
+
+class PoolMetrics:
+    """Counters describing how callers wait on a connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_checkout(self, wait: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += wait
+            self.wait_time_max = max(self.wait_time_max, wait)
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_time_total += wait
+            self.wait_time_max = max(self.wait_time_max, wait)
+
+def instrumented_pool(poolclass, metrics: PoolMetrics):
+    """Return a subclass of a queue pool that reports checkout waits to metrics."""
+
+    def connect(self):
+        overflow_before = self.overflow()
+        start = time.perf_counter()
+        try:
+            connection = poolclass.connect(self)
+        except exc.TimeoutError:
+            metrics.record_timeout(time.perf_counter() - start)
+            raise
+        overflow_after = self.overflow()
+        metrics.record_checkout(
+            time.perf_counter() - start,
+            overflow_after > 0 and overflow_after > overflow_before,
+        )
+        return connection
+
+    # Pools re-create themselves from self.__class__, so the metrics survive dispose()
+    return type(f"Instrumented{poolclass.__name__}", (poolclass,), {"connect": connect, "metrics": metrics})
+
+def pool_options(url: str, metrics: PoolMetrics) -> dict:
+    """Build create_engine pool arguments for a URL from the environment."""
+    parsed = make_url(url)
+    poolclass = parsed.get_dialect().get_pool_class(parsed)
+    if poolclass is NullPool and parsed.get_dialect().is_async:
+        # aiosqlite defaults to NullPool for file databases; pool them like the sync engine
+        poolclass = AsyncAdaptedQueuePool
+    if not issubclass(poolclass, QueuePool):
+        # In-memory SQLite uses a singleton/static pool that takes no sizing options
+        return {}
+    return {
+        "poolclass": instrumented_pool(poolclass, metrics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+# Accepted values of the SQLite pragmas that take a keyword
+SQLITE_PRAGMA_CHOICES = {
+    "journal_mode": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+}
+
+def sqlite_pragmas() -> Dict[str, object]:
+    """PRAGMA name -> value from the environment, in the order they are applied.
+
+    busy_timeout goes first so the remaining pragmas wait out a concurrent
+    writer instead of failing with "database is locked".
+    """
+    pragmas = {
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "journal_mode": SQLITE_JOURNAL_MODE,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "cache_size": SQLITE_CACHE_SIZE,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "temp_store": SQLITE_TEMP_STORE,
+    }
+    for name, choices in SQLITE_PRAGMA_CHOICES.items():
+        if pragmas[name] not in choices:
+            raise ValueError(f"SQLITE_{name.upper()} must be one of {', '.join(choices)}, not {pragmas[name]!r}")
+    return pragmas
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, object]):
+    """Run the pragmas on a DBAPI connection (sqlite3, or SQLAlchemy's aiosqlite adapter)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+            if name == "journal_mode":
+                # The mode actually in effect; WAL is refused for in-memory databases and some filesystems
+                mode = cursor.fetchone()[0].upper()
+                if mode != value and mode != "MEMORY":
+                    logger.warning("SQLite journal_mode is %s, not %s", mode, value)
+    finally:
+        cursor.close()
+
+def use_sqlite_profile(engine, pragmas: Dict[str, object]):
+    """Apply the pragmas to every connection a (sync) SQLite engine opens; other dialects are left alone."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+def redact_parameters(parameters):
+    """Replace bound values with their type names so logged queries carry no data."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) if isinstance(value, (dict, list, tuple)) else type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+class SlowQueryLog:
+    """Ring buffer of statements slower than a threshold, with their query plans."""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, size: int = SLOW_QUERY_LOG_SIZE, explain: bool = SLOW_QUERY_EXPLAIN):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.entries = deque(maxlen=size)
+
+    def attach(self, engine):
+        """Time every statement on a (sync) engine; async engines pass .sync_engine."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - context._slow_query_start) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "statement": statement,
+            "parameters": redact_parameters(parameters),
+            "executemany": executemany,
+            "plan": None,
+        }
+        keyword = (statement.split(None, 1) or [""])[0].upper()
+        if self.explain and not executemany and keyword in ("SELECT", "WITH"):
+            entry["plan"] = self._explain(conn, statement, parameters)
+        self.entries.append(entry)
+        logger.warning("Slow query (%.1f ms): %s %s", duration_ms, statement, entry["parameters"])
+
+    def _explain(self, conn, statement, parameters):
+        """Plan the statement on the same connection, on a separate cursor so pending rows are untouched.
+
+        Outside SQLite the EXPLAIN runs in a SAVEPOINT: on PostgreSQL a failed
+        statement aborts the transaction, which would fail the rest of the request.
+        """
+        sqlite = conn.dialect.name == "sqlite"
+        prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                if not sqlite:
+                    cursor.execute("SAVEPOINT slow_query_explain")
+                try:
+                    cursor.execute(prefix + statement, parameters)
+                    plan = [" | ".join(str(column) for column in row) for row in cursor.fetchall()]
+                except Exception:
+                    if not sqlite:
+                        cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                    raise
+                if not sqlite:
+                    cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+                return plan
+            finally:
+                cursor.close()
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+
+    def describe(self) -> dict:
+        return {"threshold_ms": self.threshold_ms, "entries": list(self.entries)}
+
+# Pool metrics for each engine, keyed by the name reported under /metrics
+pool_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, pool_metrics["sync"]))
+
+# Create async SQLAlchemy engine used by the API routes
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, pool_metrics["async"]))
+
+# Tune SQLite connections on both engines (journal mode, sync level, caches, lock waits)
+if SQLITE_TUNING:
+    for tuned_engine in (engine, async_engine.sync_engine):
+        use_sqlite_profile(tuned_engine, sqlite_pragmas())
+
+# Log slow statements on both engines when SLOW_QUERY_MS is set
+slow_query_log = SlowQueryLog()
+if SLOW_QUERY_MS > 0:
+    slow_query_log.attach(engine)
+    slow_query_log.attach(async_engine.sync_engine)
+
+def _dispose_inherited_pools():
+    """Drop pooled connections copied from the parent so a forked worker never shares them."""
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+# Pre-fork servers (e.g. gunicorn --preload) import the app once and then fork workers
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_inherited_pools)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class
 Base = declarative_base()
 
+def pool_status() -> dict:
+    """Snapshot of pool usage and wait statistics for each engine."""
+    status = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        metrics = pool_metrics[name]
+        entry = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+            )
+        entry.update(
+            checkouts=metrics.checkouts,
+            overflow_events=metrics.overflow_events,
+            timeouts=metrics.timeouts,
+            wait_time_total_seconds=round(metrics.wait_time_total, 6),
+            wait_time_max_seconds=round(metrics.wait_time_max, 6),
+            wait_time_avg_seconds=round(metrics.wait_time_total / metrics.checkouts, 6) if metrics.checkouts else 0.0,
+        )
+        status[name] = entry
+    return status
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Dependency to get async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,159 @@
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Tuple, Type, Union
+import json
+import os
+import tempfile
+
+from timing import serialization
+
+# Rows written per multi-row INSERT (and per transaction when streaming) by the bulk endpoints
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+# Bytes of streamed per-record results kept in memory before spilling to a temp file
+RESULT_SPOOL_MAX_MEMORY = int(os.getenv("RESULT_SPOOL_MAX_MEMORY", str(1024 * 1024)))
+
+# Longest NDJSON line accepted; longer lines are rejected as that record's error without being buffered
+NDJSON_MAX_LINE_BYTES = int(os.getenv("NDJSON_MAX_LINE_BYTES", str(1024 * 1024)))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+class LineTooLong(ValueError):
+    """An NDJSON line longer than NDJSON_MAX_LINE_BYTES."""
+
+def is_ndjson(request: Request) -> bool:
+    """Whether the request body is newline-delimited JSON."""
+    return request.headers.get("content-type", "").split(";")[0].strip() == NDJSON_MEDIA_TYPE
+
+def record_error(error_type: str, msg: str, loc: Tuple[str, ...] = ()) -> List[dict]:
+    """Describe a rejected record in the same shape as Pydantic errors."""
+    return [{"type": error_type, "loc": list(loc), "msg": msg}]
+
+def json_error(exc: ValueError) -> List[dict]:
+    """Describe an unparseable record in the same shape as Pydantic errors."""
+    if isinstance(exc, LineTooLong):
+        return record_error("line_too_long", str(exc))
+    return record_error("json_invalid", f"Invalid JSON: {exc}")
+
+def parse_json_line(line: bytes) -> Any:
+    """Parse one NDJSON line, returning the ValueError instead of raising it."""
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return exc
+
+async def read_records(request: Request) -> List[Any]:
+    """Parse a JSON array request body into raw records."""
+    body = await request.body()
+    try:
+        records = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {exc}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of records")
+    return records
+
+async def iter_ndjson_chunks(
+    request: Request, size: int = BULK_CHUNK_SIZE, max_line: int = NDJSON_MAX_LINE_BYTES
+) -> AsyncIterator[List[Any]]:
+    """Parse an NDJSON request body incrementally, yielding lists of at most size records.
+
+    The body is pulled from the client only as fast as the caller consumes
+    chunks, so while a chunk is being written the server stops reading and TCP
+    flow control pushes back on the sender. Lines that are not valid JSON are
+    yielded as the ValueError raised while parsing them; a line longer than
+    max_line is yielded as LineTooLong and the rest of it is skipped unread.
+    """
+    chunk = []
+    # The current line so far; only newly received bytes are searched for its end
+    line = bytearray()
+    too_long = False
+
+    def end_line():
+        nonlocal too_long
+        if too_long:
+            record = LineTooLong(f"Line exceeds {max_line} bytes")
+        elif line.strip():
+            record = parse_json_line(line)
+        else:
+            record = None
+        line.clear()
+        too_long = False
+        return record
+
+    async for data in request.stream():
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if not too_long:
+                line += data[start:] if end == -1 else data[start:end]
+                if len(line) > max_line:
+                    too_long = True
+                    line.clear()
+            if end == -1:
+                break
+            start = end + 1
+            record = end_line()
+            if record is not None:
+                chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    record = end_line()
+    if record is not None:
+        chunk.append(record)
+    if chunk:
+        yield chunk
+
+def validate_records(
+    records: Iterable[Any], model: Type[BaseModel], start: int = 0
+) -> Iterator[Tuple[int, Union[BaseModel, List[dict]]]]:
+    """Yield (index, model instance) for valid records and (index, errors) for invalid ones."""
+    for index, record in enumerate(records, start):
+        if isinstance(record, ValueError):
+            yield index, json_error(record)
+            continue
+        try:
+            yield index, model.model_validate(record)
+        except ValidationError as exc:
+            yield index, json.loads(exc.json(include_url=False))
+
+def chunked(items: List[Any], size: int = BULK_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """Split a list into consecutive chunks of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class ResultSpool:
+    """Collects per-record bulk results as NDJSON without holding them all in memory."""
+
+    def __init__(self):
+        self._file = tempfile.SpooledTemporaryFile(max_size=RESULT_SPOOL_MAX_MEMORY, mode="w+b")
+        self.created = 0
+        self.failed = 0
+
+    def write(self, results: Iterable[BaseModel]):
+        with serialization():
+            for result in results:
+                if result.errors:
+                    self.failed += 1
+                else:
+                    self.created += 1
+                self._file.write(result.model_dump_json().encode() + b"\n")
+
+    def response(self) -> StreamingResponse:
+        """Stream the collected results back as NDJSON, with totals in the headers."""
+        self._file.seek(0)
+
+        def iter_file():
+            try:
+                while block := self._file.read(64 * 1024):
+                    yield block
+            finally:
+                self._file.close()
+
+        return StreamingResponse(
+            iter_file(),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"X-Created-Count": str(self.created), "X-Failed-Count": str(self.failed)},
+        )
@@ -4,7 +4,9 @@ CREATE TABLE IF NOT EXISTS batches (
     product_name TEXT NOT NULL,
     origin TEXT NOT NULL,
     harvest_date DATE NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 0,
+    last_event_at TIMESTAMP WITH TIME ZONE
 );
 
 -- Create events table
@@ -19,8 +21,13 @@ CREATE TABLE IF NOT EXISTS events (
 );
 
 -- Create indexes
-CREATE INDEX IF NOT EXISTS idx_events_batch_id ON events(batch_id);
-CREATE INDEX IF NOT EXISTS idx_batches_product_name ON batches(product_name);
+CREATE INDEX IF NOT EXISTS ix_events_batch_id_timestamp_id ON events(batch_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_events_batch_id_event_type_timestamp_id ON events(batch_id, event_type, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_events_event_type ON events(event_type);
+CREATE INDEX IF NOT EXISTS ix_events_created_at ON events(created_at);
+CREATE INDEX IF NOT EXISTS ix_batches_created_at_id ON batches(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_batches_product_name_created_at_id ON batches(product_name, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_batches_origin_created_at_id ON batches(origin, created_at, id);
 
 -- Enable Row Level Security (RLS)
 ALTER TABLE batches ENABLE ROW LEVEL SECURITY;
@@ -1,18 +1,40 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import configure_mappers
 
-from routes import batch, event
-from db import engine, Base
+from routes import admin, batch, event, metrics
+from db import async_engine, engine
+from migrations import check_schema
+from openapi_cache import OPENAPI_CACHE_DIR, cache_openapi
+from timing import TimingMiddleware, instrument_engine
+from write_queue import WRITE_QUEUE, write_queue
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolve ORM relationships now rather than during the first request
+    configure_mappers()
+    # Schema changes are applied out of band by migrate.py; refuse to serve an unmigrated database
+    async with async_engine.connect() as conn:
+        await conn.run_sync(check_schema)
+    if WRITE_QUEUE:
+        write_queue.start()
+    yield
+    # Commit writes still queued, then close this worker's pooled connections
+    await write_queue.stop()
+    await async_engine.dispose()
+    engine.dispose()
 
 app = FastAPI(
     title="PureTrace API",
     description="API for product traceability system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+if OPENAPI_CACHE_DIR:
+    cache_openapi(app, OPENAPI_CACHE_DIR)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -20,11 +42,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "Server-Timing"],
 )
 
+# Time every request (outermost, so CORS is included) and count the SQL it runs
+app.add_middleware(TimingMiddleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 # Include routers
 app.include_router(batch.router, tags=["batches"])
 app.include_router(event.router, tags=["events"])
+app.include_router(metrics.router, tags=["metrics"])
+app.include_router(admin.router, tags=["admin"])
 
 @app.get("/")
 async def root():
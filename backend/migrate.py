@@ -1,10 +1,48 @@
-from db import Base, engine
-from models.database import Batch, Event  # This imports the models to ensure they are registered with Base
+#!/usr/bin/env python3
+"""
+Apply versioned schema migrations (see migrations/versions).
 
-def run_migrations():
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    python migrate.py                 # upgrade to the latest revision
+    python migrate.py upgrade 0003    # upgrade to a given revision
+    python migrate.py current         # revision recorded in the database
+    python migrate.py history         # all revisions, marking those applied
+
+Run it once per deploy, before starting the API; the API only checks that the
+database is at the latest revision when it starts.
+"""
+import argparse
+import logging
+
+from db import engine
+from migrations import current_revision, head, load_revisions, logger, upgrade
+
+def run_migrations(target=None):
+    applied = upgrade(engine, target)
+    if applied:
+        logger.info("Database upgraded to revision %s", applied[-1])
+    else:
+        logger.info("Database already at revision %s", target or head())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["upgrade", "current", "history"], default="upgrade")
+    parser.add_argument("target", nargs="?", help="Revision to upgrade to (default: latest)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "upgrade":
+        run_migrations(args.target)
+        return
+    with engine.connect() as conn:
+        current = current_revision(conn)
+    if args.command == "current":
+        print(current or "none")
+        return
+    applied = current is not None
+    for module in load_revisions():
+        print(f"{module.revision} {'[applied]' if applied else '[pending]'} {module.__doc__.strip().splitlines()[0]}")
+        if module.revision == current:
+            applied = False
 
 if __name__ == "__main__":
-    run_migrations() 
\ No newline at end of file
+    main()
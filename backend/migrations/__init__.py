@@ -0,0 +1,133 @@
+"""
+Versioned schema migrations.
+
+Each module in migrations/versions is one revision with a `revision` id, the
+`down_revision` it follows (None for the first) and an `upgrade(engine)`
+function. upgrade() applies the revisions after the one recorded in the
+schema_version table, in order, recording each as it completes.
+
+Revisions manage their own transactions (index builds run in autocommit so
+PostgreSQL can build them CONCURRENTLY), so a revision that fails part way is
+rerun from the start: every revision must be safe to apply twice. The first
+revision creates tables from the current models, so later revisions must
+also be no-ops on a schema that already has their change.
+"""
+from sqlalchemy import Column, MetaData, String, Table, inspect, select
+from sqlalchemy.schema import CreateIndex
+from typing import List, Optional
+import importlib
+import logging
+import os
+import pkgutil
+
+logger = logging.getLogger("puretrace.migrations")
+
+# Kept out of Base.metadata so create_all and drop_all never touch it
+SCHEMA_VERSION = Table(
+    "schema_version",
+    MetaData(),
+    Column("revision", String(32), primary_key=True),
+)
+
+class SchemaVersionError(RuntimeError):
+    """The database has not been migrated to the revision this code expects."""
+
+_revisions = None
+
+def load_revisions() -> List:
+    """Revision modules in the order they apply."""
+    global _revisions
+    if _revisions is None:
+        directory = os.path.join(os.path.dirname(__file__), "versions")
+        modules = [
+            importlib.import_module(f"{__name__}.versions.{info.name}")
+            for info in pkgutil.iter_modules([directory])
+        ]
+        following = {}
+        for module in modules:
+            if module.down_revision in following:
+                raise SchemaVersionError(
+                    f"Revisions {following[module.down_revision].revision} and {module.revision} "
+                    f"both follow {module.down_revision}"
+                )
+            following[module.down_revision] = module
+        ordered = []
+        module = following.get(None)
+        while module is not None:
+            ordered.append(module)
+            module = following.get(module.revision)
+        if len(ordered) != len(modules):
+            raise SchemaVersionError("Revisions do not form a single chain from the first revision")
+        _revisions = ordered
+    return _revisions
+
+def head() -> Optional[str]:
+    revisions = load_revisions()
+    return revisions[-1].revision if revisions else None
+
+def current_revision(conn) -> Optional[str]:
+    """Revision recorded in the database, None if it has never been migrated."""
+    if not inspect(conn).has_table(SCHEMA_VERSION.name):
+        return None
+    return conn.execute(select(SCHEMA_VERSION.c.revision)).scalar()
+
+def build_indexes(engine, indexes):
+    """Create the indexes that don't exist yet, CONCURRENTLY on PostgreSQL so writes are not blocked."""
+    concurrently = engine.dialect.name == "postgresql"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for index in indexes:
+            ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+            if concurrently:
+                ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+            logger.info("Building index %s...", index.name)
+            conn.exec_driver_sql(ddl)
+
+def drop_indexes(engine, names):
+    """Drop the named indexes where they exist, CONCURRENTLY on PostgreSQL."""
+    concurrently = engine.dialect.name == "postgresql"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name in names:
+            logger.info("Dropping index %s...", name)
+            conn.exec_driver_sql(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}")
+
+def _stamp(engine, revision: str):
+    with engine.begin() as conn:
+        SCHEMA_VERSION.create(conn, checkfirst=True)
+        conn.execute(SCHEMA_VERSION.delete())
+        conn.execute(SCHEMA_VERSION.insert().values(revision=revision))
+
+def upgrade(engine, target: Optional[str] = None) -> List[str]:
+    """Apply pending revisions up to target (default: the latest), returning those applied."""
+    revisions = load_revisions()
+    known = [module.revision for module in revisions]
+    if target is not None and target not in known:
+        raise SchemaVersionError(f"Unknown revision {target}")
+    with engine.connect() as conn:
+        current = current_revision(conn)
+    if current is not None and current not in known:
+        raise SchemaVersionError(f"Database is at revision {current}, which this code does not know")
+    start = known.index(current) + 1 if current is not None else 0
+    end = known.index(target) + 1 if target is not None else len(known)
+    applied = []
+    for module in revisions[start:end]:
+        logger.info("Applying %s: %s", module.revision, module.__doc__.strip().splitlines()[0])
+        module.upgrade(engine)
+        _stamp(engine, module.revision)
+        applied.append(module.revision)
+    return applied
+
+def check_schema(conn):
+    """Raise SchemaVersionError unless the database is at the latest revision.
+
+    A revision this code does not know is only logged, so workers still running
+    the previous release keep serving after a newer release has migrated.
+    """
+    current, expected = current_revision(conn), head()
+    if current == expected:
+        return
+    if current is not None and current not in [module.revision for module in load_revisions()]:
+        logger.warning("Database is at revision %s, newer than this code's %s", current, expected)
+        return
+    raise SchemaVersionError(
+        f"Database schema is at revision {current or 'none'}, expected {expected}; run `python migrate.py`"
+    )
@@ -0,0 +1,9 @@
+"""Create the batches and events tables."""
+from db import Base
+import models.database  # noqa: F401  (registers the tables on Base)
+
+revision = "0001"
+down_revision = None
+
+def upgrade(engine):
+    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,16 @@
+"""Pad second-precision SQLite timestamps to microseconds.
+
+SQLite compares timestamps as text, so '12:00:00' written by CURRENT_TIMESTAMP
+and '12:00:00.000000' would not compare equal in keyset pagination cursors.
+"""
+from sqlalchemy import text
+
+revision = "0002"
+down_revision = "0001"
+
+def upgrade(engine):
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for table in ("batches", "events"):
+            conn.execute(text(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19"))
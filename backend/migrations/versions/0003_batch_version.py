@@ -0,0 +1,36 @@
+"""Add batches.version and last_event_at, backfilled from recorded events.
+
+The events index led by batch_id is built first (0004 would otherwise build
+it afterwards), and both columns are filled from one grouped pass over
+events rather than a subquery per batch.
+"""
+from sqlalchemy import DateTime, inspect, text
+
+from migrations import build_indexes, logger
+from models.database import Event
+
+revision = "0003"
+down_revision = "0002"
+
+# Lets the GROUP BY below read events in batch_id order instead of sorting them
+BACKFILL_INDEX = "ix_events_batch_id_timestamp_id"
+
+def upgrade(engine):
+    with engine.connect() as conn:
+        if "version" in {col["name"] for col in inspect(conn).get_columns("batches")}:
+            return
+    build_indexes(engine, [index for index in Event.__table__.indexes if index.name == BACKFILL_INDEX])
+    with engine.begin() as conn:
+        existing = {col["name"] for col in inspect(conn).get_columns("batches")}
+        logger.info("Adding column batches.version...")
+        conn.exec_driver_sql("ALTER TABLE batches ADD COLUMN version INTEGER DEFAULT 0 NOT NULL")
+        if "last_event_at" not in existing:
+            timestamp = DateTime(timezone=True).compile(dialect=engine.dialect)
+            logger.info("Adding column batches.last_event_at...")
+            conn.exec_driver_sql(f"ALTER TABLE batches ADD COLUMN last_event_at {timestamp}")
+        conn.execute(text(
+            "UPDATE batches SET version = counts.events, last_event_at = counts.last_event_at "
+            "FROM (SELECT batch_id, count(*) AS events, max(created_at) AS last_event_at "
+            "FROM events GROUP BY batch_id) AS counts "
+            "WHERE batches.id = counts.batch_id"
+        ))
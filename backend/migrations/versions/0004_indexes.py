@@ -0,0 +1,20 @@
+"""Build model indexes missing from databases created before they were declared.
+
+create_all only creates indexes together with new tables. On PostgreSQL the
+indexes are built CONCURRENTLY so writes to the table are not blocked.
+"""
+from db import Base
+from migrations import build_indexes, drop_indexes
+import models.database  # noqa: F401  (registers the tables on Base)
+
+revision = "0004"
+down_revision = "0003"
+
+# Indexes replaced by a wider index with the same leading columns
+SUPERSEDED_INDEXES = ["ix_events_batch_id_timestamp"]
+
+def upgrade(engine):
+    build_indexes(engine, [
+        index for table in Base.metadata.sorted_tables for index in sorted(table.indexes, key=lambda idx: idx.name)
+    ])
+    drop_indexes(engine, SUPERSEDED_INDEXES)
@@ -0,0 +1,72 @@
+"""Convert 36-character string keys from older databases to binary UUIDs.
+
+This is not an online migration: stop the API before running it. Workers
+from earlier releases bind string IDs and miss converted rows, and new
+workers refuse to start until the database is at the latest revision. On
+SQLite the rows are rewritten in small transactions walked by rowid, so an
+interrupted run resumes where it stopped. On PostgreSQL both tables are
+rewritten by ALTER ... TYPE uuid in one transaction under an exclusive lock.
+"""
+from sqlalchemy import inspect, text
+import uuid
+
+from migrations import logger
+
+revision = "0005"
+down_revision = "0004"
+
+def _convert_sqlite_keys(conn, table: str, column: str, chunk_size: int, related=None) -> int:
+    """Rewrite text UUIDs in table.column as 16-byte blobs, one chunk per transaction."""
+    converted = 0
+    last_rowid = 0
+    while True:
+        with conn.begin():
+            rows = conn.execute(
+                text(
+                    f"SELECT rowid, {column} FROM {table} WHERE rowid > :last AND typeof({column}) = 'text' "
+                    f"ORDER BY rowid LIMIT :n"
+                ),
+                {"last": last_rowid, "n": chunk_size},
+            ).all()
+            if not rows:
+                return converted
+            last_rowid = rows[-1][0]
+            old_keys = {key for _, key in rows}
+            params = [{"new": uuid.UUID(old).bytes, "old": old} for old in old_keys]
+            conn.execute(text(f"UPDATE {table} SET {column} = :new WHERE {column} = :old"), params)
+            if related:
+                # Move referencing rows in the same transaction so they never point at a missing key
+                ref_table, ref_column = related
+                conn.execute(text(f"UPDATE {ref_table} SET {ref_column} = :new WHERE {ref_column} = :old"), params)
+        converted += len(old_keys)
+
+def upgrade(engine, chunk_size: int = 1000):
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            batches = _convert_sqlite_keys(conn, "batches", "id", chunk_size, related=("events", "batch_id"))
+            orphans = _convert_sqlite_keys(conn, "events", "batch_id", chunk_size)
+            events = _convert_sqlite_keys(conn, "events", "id", chunk_size)
+        logger.info("Converted %d batch keys, %d event keys and %d orphaned event references", batches, events, orphans)
+    elif engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            inspector = inspect(conn)
+            key_types = [
+                col["type"]
+                for table in ("batches", "events")
+                for col in inspector.get_columns(table)
+                if col["name"] in ("id", "batch_id")
+            ]
+            if all(key_type.python_type is uuid.UUID for key_type in key_types):
+                logger.info("UUID keys already use the native uuid type")
+                return
+            foreign_keys = [fk for fk in inspector.get_foreign_keys("events") if fk["referred_table"] == "batches"]
+            for fk in foreign_keys:
+                conn.execute(text(f'ALTER TABLE events DROP CONSTRAINT "{fk["name"]}"'))
+            for table, column in (("batches", "id"), ("events", "id"), ("events", "batch_id")):
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE uuid USING {column}::uuid"))
+            for fk in foreign_keys:
+                conn.execute(text(
+                    f'ALTER TABLE events ADD CONSTRAINT "{fk["name"]}" FOREIGN KEY (batch_id) '
+                    f"REFERENCES batches (id) ON DELETE CASCADE"
+                ))
+        logger.info("Converted UUID keys to the native uuid type")
@@ -0,0 +1,15 @@
+"""Drop single-column indexes covered by the leading column of a wider index.
+
+events.batch_id is served by ix_events_batch_id_timestamp_id, and
+batches.product_name by ix_batches_product_name_created_at_id, so these only
+slowed inserts down. The idx_ names are those created by init.sql.
+"""
+from migrations import drop_indexes
+
+revision = "0006"
+down_revision = "0005"
+
+SUPERSEDED_INDEXES = ["ix_events_batch_id", "idx_events_batch_id", "idx_batches_product_name"]
+
+def upgrade(engine):
+    drop_indexes(engine, SUPERSEDED_INDEXES)
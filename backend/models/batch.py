@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from datetime import date, datetime
-from typing import Optional, List, Union
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 
 class BatchBase(BaseModel):
@@ -11,60 +11,81 @@ class BatchBase(BaseModel):
 class BatchCreate(BatchBase):
     pass
 
+# UUID fields are validated as UUIDs and written as their canonical string by
+# Pydantic's built-in serializer, so no per-field Python hooks run on reads
+
 class BatchEvent(BaseModel):
-    id: Union[str, UUID] = Field(..., description="Unique identifier for the event")
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID = Field(..., description="Unique identifier for the event")
     event_type: str = Field(..., description="Type of event")
     description: str = Field(..., description="Description of the event")
     timestamp: date = Field(..., description="Timestamp of the event")
     location: str = Field(..., description="Location where the event occurred")
-    batch_id: Union[str, UUID] = Field(..., description="ID of the batch this event belongs to")
+    batch_id: UUID = Field(..., description="ID of the batch this event belongs to")
     created_at: datetime = Field(..., description="When the event was recorded")
 
-    @validator('id', 'batch_id', pre=True)
-    def convert_uuid_to_str(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v
-
-    class Config:
-        from_attributes = True
-
 class BatchEventCreate(BaseModel):
     event_type: str = Field(..., description="Type of event")
     description: str = Field(..., description="Description of the event")
     timestamp: date = Field(..., description="Timestamp of the event")
     location: str = Field(..., description="Location where the event occurred")
-    batch_id: Union[str, UUID] = Field(..., description="ID of the batch this event belongs to")
+    batch_id: str = Field(..., description="ID of the batch this event belongs to")
 
-    @validator('batch_id', pre=True)
+    # Kept as a string so the routes can answer a malformed ID with 400 rather than 422
+    @field_validator('batch_id', mode='before')
+    @classmethod
     def convert_uuid_to_str(cls, v):
         if isinstance(v, UUID):
             return str(v)
         return v
 
 class Batch(BatchBase):
-    id: Union[str, UUID] = Field(..., description="Unique identifier for the batch")
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID = Field(..., description="Unique identifier for the batch")
     created_at: datetime = Field(..., description="When the batch was created")
     events: List[BatchEvent] = Field(default_factory=list, description="List of events associated with this batch")
 
-    @validator('id', pre=True)
-    def convert_uuid_to_str(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v
-
-    class Config:
-        from_attributes = True
-
 class BatchCreationResponse(BaseModel):
-    batch_id: Union[str, UUID] = Field(..., description="Unique identifier for the created batch")
+    batch_id: UUID = Field(..., description="Unique identifier for the created batch")
     trace_url: str = Field(..., description="URL to trace the batch on the frontend")
     product_name: str
     origin: str
     harvest_date: date
 
-    @validator('batch_id', pre=True)
-    def convert_uuid_to_str(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v 
\ No newline at end of file
+class BatchSummary(BatchBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID = Field(..., description="Unique identifier for the batch")
+    created_at: datetime = Field(..., description="When the batch was created")
+    event_count: int = Field(..., description="Number of events recorded for this batch")
+
+class BatchPage(BaseModel):
+    items: List[BatchSummary] = Field(..., description="Batches on this page, newest first")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, or null on the last page")
+
+class BulkBatchResult(BaseModel):
+    index: int = Field(..., description="Position of the record in the request body")
+    batch_id: Optional[UUID] = Field(None, description="Unique identifier for the created batch")
+    trace_url: Optional[str] = Field(None, description="URL to trace the batch on the frontend")
+    errors: Optional[List[Dict[str, Any]]] = Field(None, description="Validation errors if the record was rejected")
+
+class BulkBatchResponse(BaseModel):
+    created: int = Field(..., description="Number of batches created")
+    failed: int = Field(..., description="Number of records rejected")
+    results: List[BulkBatchResult] = Field(..., description="One result per input record, in input order")
+
+class BulkEventResult(BaseModel):
+    index: int = Field(..., description="Position of the record in the request body")
+    event_id: Optional[UUID] = Field(None, description="Unique identifier for the created event")
+    errors: Optional[List[Dict[str, Any]]] = Field(None, description="Errors if the record was rejected")
+
+class BulkEventResponse(BaseModel):
+    created: int = Field(..., description="Number of events created")
+    failed: int = Field(..., description="Number of records rejected")
+    results: List[BulkEventResult] = Field(..., description="One result per input record, in input order")
+
+# Validators/serializers for list responses, compiled once at import rather than per request
+BatchEventList = TypeAdapter(List[BatchEvent])
+BatchSummaryList = TypeAdapter(List[BatchSummary])
@@ -1,27 +1,48 @@
-from sqlalchemy import Column, String, Date, ForeignKey, DateTime
+from sqlalchemy import Column, String, Date, ForeignKey, DateTime, Index, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
 from db import Base
-import uuid
+from models.types import BinaryUUID
+from utils import uuid7
+
+def utcnow() -> datetime:
+    # Set in Python so stored timestamps keep microseconds and sort consistently for keyset cursors
+    return datetime.now(timezone.utc)
 
 class Batch(Base):
     __tablename__ = "batches"
+    __table_args__ = (
+        # Serve keyset pagination of GET /batches, unfiltered and filtered by product or origin
+        Index("ix_batches_created_at_id", "created_at", "id"),
+        Index("ix_batches_product_name_created_at_id", "product_name", "created_at", "id"),
+        Index("ix_batches_origin_created_at_id", "origin", "created_at", "id"),
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(BinaryUUID, primary_key=True, default=uuid7)
     product_name = Column(String, nullable=False)
     origin = Column(String, nullable=False)
     harvest_date = Column(Date, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    events = relationship("Event", back_populates="batch", cascade="all, delete-orphan")
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    # Bumped in the same transaction as every event insert, for cheap change detection
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    last_event_at = Column(DateTime(timezone=True), nullable=True)
+    events = relationship("Event", back_populates="batch", cascade="all, delete-orphan", order_by="[Event.timestamp, Event.id]")
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Serve per-batch event lookups and keyset pages ordered by (timestamp, id)
+        Index("ix_events_batch_id_timestamp_id", "batch_id", "timestamp", "id"),
+        Index("ix_events_batch_id_event_type_timestamp_id", "batch_id", "event_type", "timestamp", "id"),
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    batch_id = Column(String, ForeignKey("batches.id", ondelete="CASCADE"), nullable=False)
-    event_type = Column(String, nullable=False)
+    id = Column(BinaryUUID, primary_key=True, default=uuid7)
+    # No index of its own: ix_events_batch_id_timestamp_id leads with batch_id
+    batch_id = Column(BinaryUUID, ForeignKey("batches.id", ondelete="CASCADE"), nullable=False)
+    event_type = Column(String, nullable=False, index=True)
     description = Column(String, nullable=False)
     timestamp = Column(Date, nullable=False)
     location = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), index=True)
     batch = relationship("Batch", back_populates="events") 
\ No newline at end of file
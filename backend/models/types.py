@@ -0,0 +1,29 @@
+from sqlalchemy.types import LargeBinary, TypeDecorator, Uuid
+import uuid
+
+class BinaryUUID(TypeDecorator):
+    """UUID column stored natively on PostgreSQL and as 16 raw bytes elsewhere."""
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            # Generic Uuid resolves to the native uuid type without importing the PostgreSQL dialect up front
+            return dialect.type_descriptor(Uuid(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value if dialect.name == "postgresql" else value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
+        # String keys written before the binary UUID migration
+        return uuid.UUID(value)
@@ -0,0 +1,51 @@
+from fastapi import FastAPI
+import fastapi
+import hashlib
+import os
+import sys
+
+import orjson
+
+# Directory the generated OpenAPI schema is cached in across restarts (disabled when unset)
+OPENAPI_CACHE_DIR = os.getenv("OPENAPI_CACHE_DIR")
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def source_fingerprint(app: FastAPI) -> str:
+    """Hash of the loaded backend modules' sizes and mtimes, invalidated like .pyc files."""
+    digest = hashlib.sha256(f"{fastapi.__version__}:{app.version}".encode())
+    paths = sorted(
+        module.__file__
+        for module in list(sys.modules.values())
+        if getattr(module, "__file__", None) and module.__file__.startswith(BACKEND_DIR)
+    )
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+def cache_openapi(app: FastAPI, directory: str):
+    """Serve the OpenAPI schema from directory, generating and writing it on a miss.
+
+    FastAPI already builds the schema lazily on the first /openapi.json or
+    /docs request; this saves each new worker from building it again.
+    """
+    generate = app.openapi
+
+    def openapi():
+        if app.openapi_schema is None:
+            path = os.path.join(directory, f"openapi-{source_fingerprint(app)}.json")
+            try:
+                with open(path, "rb") as f:
+                    app.openapi_schema = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError):
+                schema = generate()
+                # Write then rename, so concurrent workers never read a partial file
+                os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(orjson.dumps(schema))
+                os.replace(tmp_path, path)
+        return app.openapi_schema
+
+    app.openapi = openapi
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Optional
+import hmac
+import os
+
+from db import slow_query_log
+from serializers import json_response
+
+router = APIRouter()
+
+# Token required by the admin endpoints (they answer 404 when unset)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token header")
+
+@router.get("/admin/slow-queries", dependencies=[Depends(require_admin_token)])
+async def get_slow_queries():
+    """Most recent statements slower than SLOW_QUERY_MS, newest last, with redacted parameters and query plans."""
+    return json_response(slow_query_log.describe())
+
+@router.delete("/admin/slow-queries", dependencies=[Depends(require_admin_token)])
+async def clear_slow_queries():
+    """Empty the slow-query ring buffer."""
+    slow_query_log.entries.clear()
+    return {"cleared": True}
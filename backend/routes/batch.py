@@ -1,20 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Optional
 from uuid import uuid4
+import os
 
-from models.batch import BatchCreate, Batch as PydanticBatch, BatchCreationResponse
-from models.database import Batch as SQLAlchemyBatch
-from db import get_db
-from utils import validate_uuid
+from models.batch import BatchCreate, Batch as PydanticBatch, BatchCreationResponse, BatchPage, BatchSummaryList, BulkBatchResponse, BulkBatchResult
+from models.database import Batch as SQLAlchemyBatch, Event as SQLAlchemyEvent
+from cache import batch_cache_key, get_cache, get_validated, set_validated
+from conditional import is_not_modified, load_batch_validators, not_modified_response, validator_headers
+from db import get_async_db
+from serializers import batch_with_events_query, json_response, serialize_batch
+from timing import serialization
+from write_queue import apply_write
+from ingest import NDJSON_MEDIA_TYPE, ResultSpool, chunked, is_ndjson, iter_ndjson_chunks, read_records, record_error, validate_records
+from utils import decode_cursor, encode_cursor, uuid7, validate_uuid
 
 router = APIRouter()
 
 # Configuration for the frontend URL (can be moved to a config file later)
 FRONTEND_BASE_URL = "http://localhost:5173"
 
+# Page sizes for GET /batches
+BATCH_PAGE_SIZE = int(os.getenv("BATCH_PAGE_SIZE", "50"))
+BATCH_PAGE_SIZE_MAX = int(os.getenv("BATCH_PAGE_SIZE_MAX", "500"))
+
 @router.post("/batch", response_model=BatchCreationResponse)
-async def create_batch(batch_input: BatchCreate, request: Request, db: Session = Depends(get_db)):
+async def create_batch(batch_input: BatchCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Create a new batch and return its ID and trace URL."""
     try:
         db_batch = SQLAlchemyBatch(
@@ -22,43 +35,212 @@ async def create_batch(batch_input: BatchCreate, request: Request, db: Session =
             origin=batch_input.origin,
             harvest_date=batch_input.harvest_date
         )
-        db.add(db_batch)
-        db.commit()
-        db.refresh(db_batch)
+
+        async def write(session: AsyncSession):
+            session.add(db_batch)
+            # The id and timestamps are generated in Python, so the flushed object is complete
+            await session.flush()
+
+        # Committed here, or with other queued writes when WRITE_QUEUE is on
+        await apply_write(db, write)
 
         # Construct the trace_url
         # Using request.url_for is more robust but requires naming the GET route.
         # For simplicity here, we construct it directly.
         trace_url = f"{FRONTEND_BASE_URL}/trace/{db_batch.id}"
 
-        return BatchCreationResponse(
+        return json_response(BatchCreationResponse(
             batch_id=db_batch.id,
             trace_url=trace_url,
             product_name=db_batch.product_name,
             origin=db_batch.origin,
             harvest_date=db_batch.harvest_date
-        )
+        ))
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # Consider logging the exception e
         raise HTTPException(status_code=500, detail=f"Failed to create batch: {str(e)}")
 
+@router.get("/batches", response_model=BatchPage)
+async def list_batches(
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(BATCH_PAGE_SIZE, ge=1, le=BATCH_PAGE_SIZE_MAX, description="Maximum number of batches to return"),
+    product_name: Optional[str] = Query(None, description="Only batches with this product name"),
+    origin: Optional[str] = Query(None, description="Only batches from this origin"),
+    harvest_from: Optional[date] = Query(None, description="Only batches harvested on or after this date"),
+    harvest_to: Optional[date] = Query(None, description="Only batches harvested on or before this date"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List batches newest first using keyset pagination on (created_at, id)."""
+    event_count = (
+        select(func.count(SQLAlchemyEvent.id))
+        .filter(SQLAlchemyEvent.batch_id == SQLAlchemyBatch.id)
+        .scalar_subquery()
+    )
+    query = select(SQLAlchemyBatch, event_count)
+    if cursor:
+        position = decode_cursor(cursor)
+        if not position:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: '{cursor}'")
+        # Seek past the last row of the previous page instead of using OFFSET
+        query = query.filter(
+            tuple_(SQLAlchemyBatch.created_at, SQLAlchemyBatch.id)
+            < tuple_(*position, types=[SQLAlchemyBatch.created_at.type, SQLAlchemyBatch.id.type])
+        )
+    if product_name is not None:
+        query = query.filter(SQLAlchemyBatch.product_name == product_name)
+    if origin is not None:
+        query = query.filter(SQLAlchemyBatch.origin == origin)
+    if harvest_from is not None:
+        query = query.filter(SQLAlchemyBatch.harvest_date >= harvest_from)
+    if harvest_to is not None:
+        query = query.filter(SQLAlchemyBatch.harvest_date <= harvest_to)
+    # Fetch one extra row to learn whether another page follows
+    query = query.order_by(SQLAlchemyBatch.created_at.desc(), SQLAlchemyBatch.id.desc()).limit(limit + 1)
+
+    try:
+        rows = (await db.execute(query)).all()
+    except Exception as e:
+        # Consider logging the exception e
+        raise HTTPException(status_code=500, detail=f"Failed to list batches: {str(e)}")
+
+    items = BatchSummaryList.validate_python([
+        {
+            "id": batch.id,
+            "product_name": batch.product_name,
+            "origin": batch.origin,
+            "harvest_date": batch.harvest_date,
+            "created_at": batch.created_at,
+            "event_count": count,
+        }
+        for batch, count in rows[:limit]
+    ])
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1][0]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    # The page is already validated; serialize it once instead of letting FastAPI re-validate it
+    page = BatchPage(items=items, next_cursor=next_cursor)
+    with serialization():
+        body = page.model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+def build_batch_rows(chunk):
+    """Split a validated chunk into rows to insert and per-record results."""
+    rows = []
+    results = []
+    for index, record in chunk:
+        if isinstance(record, BatchCreate):
+            batch_id = uuid7()
+            rows.append({
+                "id": batch_id,
+                "product_name": record.product_name,
+                "origin": record.origin,
+                "harvest_date": record.harvest_date,
+            })
+            results.append(BulkBatchResult(index=index, batch_id=batch_id, trace_url=f"{FRONTEND_BASE_URL}/trace/{batch_id}"))
+        else:
+            results.append(BulkBatchResult(index=index, errors=record))
+    return rows, results
+
+@router.post("/batches/bulk", response_model=BulkBatchResponse, responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}})
+async def create_batches_bulk(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Create many batches from a JSON array or NDJSON body of BatchCreate records.
+
+    A JSON array is inserted in chunked multi-row INSERTs inside a single
+    transaction. An NDJSON body is streamed: each chunk is inserted and
+    committed on its own and results are returned as NDJSON. Invalid records
+    are reported with their validation errors. Results are in input order.
+    """
+    if is_ndjson(request):
+        return await stream_batches(request, db)
+
+    records = await read_records(request)
+
+    results = []
+    created = 0
+    try:
+        for chunk in chunked(list(validate_records(records, BatchCreate))):
+            rows, chunk_results = build_batch_rows(chunk)
+            if rows:
+                await db.execute(insert(SQLAlchemyBatch).values(rows))
+            results.extend(chunk_results)
+            created += len(rows)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        # Consider logging the exception e
+        raise HTTPException(status_code=500, detail=f"Failed to create batches: {str(e)}")
+
+    return json_response(BulkBatchResponse(created=created, failed=len(results) - created, results=results))
+
+async def stream_batches(request: Request, db: AsyncSession):
+    """Insert an NDJSON stream of batches one fixed-size transaction at a time."""
+    spool = ResultSpool()
+    index = 0
+    async for records in iter_ndjson_chunks(request):
+        rows, results = build_batch_rows(validate_records(records, BatchCreate, start=index))
+        index += len(records)
+        try:
+            if rows:
+                await db.execute(insert(SQLAlchemyBatch).values(rows))
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            # Only this chunk is lost; earlier chunks are already committed
+            results = [
+                BulkBatchResult(index=result.index, errors=record_error("database_error", f"Failed to create batch: {str(e)}"))
+                if result.errors is None else result
+                for result in results
+            ]
+        spool.write(results)
+    return spool.response()
+
 @router.get("/batch/{batch_id}", response_model=PydanticBatch)
-async def get_batch(batch_id: str, db: Session = Depends(get_db)):
-    """Get a batch by ID with all its events."""
+async def get_batch(batch_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Get a batch by ID with all its events.
+
+    Responses carry an ETag and Last-Modified derived from the batch and its
+    newest event; matching If-None-Match / If-Modified-Since requests get a 304
+    without the events being loaded. Serialized responses are kept in the
+    read-through response cache together with their ETag, dropped whenever an
+    event is added, and ignored once the batch's ETag no longer matches.
+    """
     # Validate the batch_id format first
     validated_uuid = validate_uuid(batch_id)
     if not validated_uuid:
         raise HTTPException(status_code=400, detail=f"Invalid batch ID format: '{batch_id}'")
-    
+
     try:
-        # Query using the validated UUID and eager load events
-        db_batch = db.query(SQLAlchemyBatch).options(joinedload(SQLAlchemyBatch.events)).filter(SQLAlchemyBatch.id == validated_uuid).first()
-        if db_batch is None:
+        validators = await load_batch_validators(db, validated_uuid)
+        if validators is None:
+            raise HTTPException(status_code=404, detail=f"Batch with id '{validated_uuid}' not found")
+        etag, last_modified = validators
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        headers = validator_headers(etag, last_modified)
+
+        cache = get_cache()
+        cache_key = batch_cache_key(validated_uuid)
+        cached = await get_validated(cache, cache_key, etag)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json", headers=headers)
+
+        # Load the batch and its events as plain rows and serialize them directly,
+        # producing the same JSON as the Batch response model without building it
+        result = await db.execute(batch_with_events_query(validated_uuid))
+        rows = result.all()
+        with serialization():
+            body = serialize_batch(rows)
+        if body is None:
             raise HTTPException(status_code=404, detail=f"Batch with id '{validated_uuid}' not found")
-        return db_batch
     except HTTPException as http_exc: # Re-raise HTTPExceptions
         raise http_exc
     except Exception as e:
         # Consider logging the exception e
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve batch: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve batch: {str(e)}")
+
+    await set_validated(cache, cache_key, etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
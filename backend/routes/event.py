@@ -1,73 +1,318 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List # Keep for future use if listing events
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import and_, bindparam, insert, literal, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
 from uuid import UUID # For type hinting batch_id if needed explicitly
+import os
 
-from models.batch import BatchEvent as PydanticBatchEvent, BatchEventCreate # Use Pydantic models
-from models.database import Event as SQLAlchemyEvent, Batch as SQLAlchemyBatch # SQLAlchemy models
-from db import get_db
+from models.batch import BatchEvent as PydanticBatchEvent, BatchEventCreate, BulkEventResponse, BulkEventResult # Use Pydantic models
+from models.database import Event as SQLAlchemyEvent, Batch as SQLAlchemyBatch, utcnow # SQLAlchemy models
+from cache import invalidate_batches
+from conditional import VALIDATOR_COLUMNS, as_utc, batch_validators, has_preconditions, is_not_modified, load_batch_validators, make_etag, not_modified_response, validator_headers
+from db import get_async_db
+from serializers import EVENT_COLUMNS, event_dict, json_response, serialize_event, serialize_events
+from timing import serialization
+from write_queue import apply_write
+from ingest import NDJSON_MEDIA_TYPE, ResultSpool, chunked, is_ndjson, iter_ndjson_chunks, read_records, record_error, validate_records
 # from utils import validate_uuid, format_event # No longer needed if returning Pydantic model directly
 
 router = APIRouter()
 
+# Largest page GET /batch/{batch_id}/events will return in one response
+EVENT_PAGE_SIZE_MAX = int(os.getenv("EVENT_PAGE_SIZE_MAX", "1000"))
+
+async def record_batch_events(db: AsyncSession, added: Dict[UUID, int], at: datetime):
+    """Advance version and last_event_at for batches that gained events, in the caller's transaction."""
+    batches = SQLAlchemyBatch.__table__
+    await db.execute(
+        update(batches)
+        .where(batches.c.id == bindparam("batch_key"))
+        .values(version=batches.c.version + bindparam("added"), last_event_at=bindparam("at")),
+        [{"batch_key": batch_id, "added": count, "at": at} for batch_id, count in added.items()],
+    )
+
+def insert_event_statement(dialect: str, values: dict, at: datetime):
+    """Statement(s) that bump the batch version and insert one event, returning the stored event.
+
+    On PostgreSQL the version bump runs in a data-modifying CTE that feeds the
+    INSERT, so a missing batch inserts nothing and the whole write is one
+    statement. Other databases run the UPDATE first and check its rowcount.
+    """
+    batches = SQLAlchemyBatch.__table__
+    bump = (
+        update(batches)
+        .where(batches.c.id == values["batch_id"])
+        .values(version=batches.c.version + 1, last_event_at=at)
+    )
+    if dialect == "postgresql":
+        bumped = bump.returning(batches.c.id).cte("bumped")
+        columns = [column for column in EVENT_COLUMNS if column.key != "batch_id"]
+        source = select(
+            *(literal(values[column.key], column.type) for column in columns),
+            bumped.c.id,
+        )
+        insert_event = (
+            insert(SQLAlchemyEvent)
+            .from_select([*(column.key for column in columns), "batch_id"], source)
+            .returning(*EVENT_COLUMNS)
+        )
+        return None, insert_event
+    return bump, insert(SQLAlchemyEvent).values(**values).returning(*EVENT_COLUMNS)
+
 @router.post("/event", response_model=PydanticBatchEvent) # Use Pydantic model for response
-async def create_event(event_input: BatchEventCreate, db: Session = Depends(get_db)):
+async def create_event(event_input: BatchEventCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new event for a batch."""
+    from utils import uuid7, validate_uuid
+
+    # Validate the batch_id format first
+    validated_uuid = validate_uuid(event_input.batch_id)
+    if not validated_uuid:
+        raise HTTPException(status_code=400, detail=f"Invalid batch ID format: '{event_input.batch_id}'")
+
+    not_found = HTTPException(
+        status_code=404,
+        detail=f"Batch with id {event_input.batch_id} not found. Cannot add event."
+    )
     try:
-        # 1. Validate that the batch_id exists
-        existing_batch = db.query(SQLAlchemyBatch).filter(SQLAlchemyBatch.id == event_input.batch_id).first()
-        if not existing_batch:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Batch with id {event_input.batch_id} not found. Cannot add event."
-            )
+        # 1. Build the row; every column is generated here, so nothing needs reading back
+        values = {
+            "id": uuid7(),
+            "batch_id": validated_uuid,
+            "event_type": event_input.event_type,
+            "description": event_input.description,
+            "timestamp": event_input.timestamp,
+            "location": event_input.location,
+            "created_at": utcnow(),
+        }
+
+        # 2. Bump the batch version (a missing batch matches no row: 404) and insert with RETURNING
+        bump, insert_event = insert_event_statement(db.bind.dialect.name, values, values["created_at"])
+
+        async def write(session: AsyncSession):
+            if bump is not None and (await session.execute(bump)).rowcount == 0:
+                raise not_found
+            row = (await session.execute(insert_event)).first()
+            if row is None:
+                raise not_found
+            return row
+
+        # Committed here, or with other queued writes when WRITE_QUEUE is on
+        row = await apply_write(db, write)
+        await invalidate_batches([validated_uuid])
+
+        # 3. Return the stored event
+        with serialization():
+            body = serialize_event(row)
+        return Response(content=body, media_type="application/json")
 
-        # 2. Create SQLAlchemy Event model instance
-        db_event = SQLAlchemyEvent(
-            batch_id=event_input.batch_id,
-            event_type=event_input.event_type,
-            description=event_input.description,
-            timestamp=event_input.timestamp,
-            location=event_input.location
-            # id and created_at will be auto-generated by the DB model
-        )
-        
-        # 3. Add, commit, and refresh
-        db.add(db_event)
-        db.commit()
-        db.refresh(db_event)
-        
-        # 4. Return the created event (FastAPI will convert to Pydantic model)
-        return db_event
-        
     except HTTPException as http_exc: # Re-raise HTTPExceptions to preserve status code and detail
+        await db.rollback()
         raise http_exc
     except Exception as e:
-        db.rollback() # Rollback in case of other errors
+        await db.rollback() # Rollback in case of other errors
         # Consider logging the exception e
         raise HTTPException(status_code=500, detail=f"Failed to create event: {str(e)}")
 
+async def write_event_chunk(db: AsyncSession, chunk) -> List[BulkEventResult]:
+    """Insert and commit the valid events of a validated chunk; return per-record results."""
+    from utils import uuid7, validate_uuid
+
+    # 1. Drop records that failed validation or carry a malformed batch_id
+    results = {}
+    candidates = []
+    for index, record in chunk:
+        if not isinstance(record, BatchEventCreate):
+            results[index] = BulkEventResult(index=index, errors=record)
+            continue
+        batch_uuid = validate_uuid(record.batch_id)
+        if not batch_uuid:
+            results[index] = BulkEventResult(
+                index=index,
+                errors=record_error("uuid_parsing", f"Invalid batch ID format: '{record.batch_id}'", ("batch_id",)),
+            )
+            continue
+        candidates.append((index, record, batch_uuid))
+
+    if candidates:
+        try:
+            # 2. Check every referenced batch in one query
+            batch_ids = {batch_uuid for _, _, batch_uuid in candidates}
+            result = await db.execute(select(SQLAlchemyBatch.id).filter(SQLAlchemyBatch.id.in_(batch_ids)))
+            existing = set(result.scalars())
+
+            # 3. Insert the events whose batch exists with one executemany
+            created_at = utcnow()
+            rows = []
+            for index, record, batch_uuid in candidates:
+                if batch_uuid not in existing:
+                    results[index] = BulkEventResult(
+                        index=index,
+                        errors=record_error("not_found", f"Batch with id {batch_uuid} not found. Cannot add event.", ("batch_id",)),
+                    )
+                    continue
+                event_id = uuid7()
+                rows.append({
+                    "id": event_id,
+                    "batch_id": batch_uuid,
+                    "event_type": record.event_type,
+                    "description": record.description,
+                    "timestamp": record.timestamp,
+                    "location": record.location,
+                    "created_at": created_at,
+                })
+                results[index] = BulkEventResult(index=index, event_id=event_id)
+            if rows:
+                await db.execute(insert(SQLAlchemyEvent), rows)
+                await record_batch_events(db, Counter(row["batch_id"] for row in rows), created_at)
+            await db.commit()
+            await invalidate_batches(row["batch_id"] for row in rows)
+        except Exception as e:
+            await db.rollback()
+            # Only this chunk is lost; earlier chunks are already committed
+            for index, _, _ in candidates:
+                results[index] = BulkEventResult(index=index, errors=record_error("database_error", f"Failed to create event: {str(e)}"))
+
+    return [results[index] for index in sorted(results)]
+
+@router.post("/events/bulk", response_model=BulkEventResponse, responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}})
+async def create_events_bulk(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Create many events from a JSON array or NDJSON body of BatchEventCreate records.
+
+    Records are processed in chunks: the batch_ids of each chunk are checked
+    with one set-based query, then the chunk's events are inserted with a single
+    executemany and committed. Rejected records are reported per record and do
+    not roll back the valid ones. An NDJSON body is parsed incrementally and
+    its results are returned as NDJSON.
+    """
+    if is_ndjson(request):
+        spool = ResultSpool()
+        index = 0
+        async for records in iter_ndjson_chunks(request):
+            spool.write(await write_event_chunk(db, validate_records(records, BatchEventCreate, start=index)))
+            index += len(records)
+        return spool.response()
+
+    records = await read_records(request)
+    results = []
+    for chunk in chunked(list(validate_records(records, BatchEventCreate))):
+        results.extend(await write_event_chunk(db, chunk))
+
+    created = sum(1 for result in results if result.errors is None)
+    return json_response(BulkEventResponse(created=created, failed=len(results) - created, results=results))
+
 @router.get("/batch/{batch_id}/events", response_model=List[PydanticBatchEvent])
-async def get_batch_events(batch_id: str, db: Session = Depends(get_db)):
-    """Get all events for a specific batch."""
-    from utils import validate_uuid
+async def get_batch_events(
+    batch_id: str,
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=EVENT_PAGE_SIZE_MAX, description="Maximum number of events to return (default: all)"),
+    event_type: Optional[str] = Query(None, description="Only events of this type"),
+    since: Optional[date] = Query(None, description="Only events with a timestamp on or after this date"),
+    until: Optional[date] = Query(None, description="Only events with a timestamp on or before this date"),
+    created_since: Optional[datetime] = Query(None, description="Only events recorded at or after this time"),
+    created_until: Optional[datetime] = Query(None, description="Only events recorded at or before this time"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get the events for a specific batch, newest first.
+
+    Events are ordered by (timestamp, id) descending. When a limit is given and
+    more events follow, the cursor for the next page is returned in the
+    X-Next-Cursor header (and as a Link rel="next"). The ETag covers the batch
+    state and the query parameters, so conditional requests for an unchanged
+    page get a 304 without the events being loaded.
+    """
+    from utils import decode_cursor, encode_cursor, validate_uuid
     
     # Validate the batch_id format first
     validated_uuid = validate_uuid(batch_id)
     if not validated_uuid:
         raise HTTPException(status_code=400, detail=f"Invalid batch ID format: '{batch_id}'")
+
+    position = None
+    if cursor:
+        position = decode_cursor(cursor, parse=date.fromisoformat)
+        if not position:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: '{cursor}'")
     
+    def page_validators(batch_etag: str, last_modified: datetime):
+        # The page's ETag also covers the query parameters
+        return make_etag(batch_etag, sorted(request.query_params.multi_items())), last_modified
+
+    # Filters and the keyset position; they go in the join condition when the batch row is read in the same query
+    conditions = []
+    if event_type is not None:
+        conditions.append(SQLAlchemyEvent.event_type == event_type)
+    if since is not None:
+        conditions.append(SQLAlchemyEvent.timestamp >= since)
+    if until is not None:
+        conditions.append(SQLAlchemyEvent.timestamp <= until)
+    # created_at is stored in UTC, and SQLite compares it as text, so offsets are applied first
+    if created_since is not None:
+        conditions.append(SQLAlchemyEvent.created_at >= as_utc(created_since))
+    if created_until is not None:
+        conditions.append(SQLAlchemyEvent.created_at <= as_utc(created_until))
+    if position:
+        conditions.append(
+            tuple_(SQLAlchemyEvent.timestamp, SQLAlchemyEvent.id)
+            < tuple_(*position, types=[SQLAlchemyEvent.timestamp.type, SQLAlchemyEvent.id.type])
+        )
+
     try:
-        # Check if batch exists
-        batch = db.query(SQLAlchemyBatch).filter(SQLAlchemyBatch.id == validated_uuid).first()
-        if not batch:
-            raise HTTPException(status_code=404, detail=f"Batch with id '{validated_uuid}' not found")
-        
-        # Get events for the batch
-        events = db.query(SQLAlchemyEvent).filter(SQLAlchemyEvent.batch_id == validated_uuid).all()
-        return events
+        if has_preconditions(request):
+            # Conditional request: check the batch row first so a 304 never loads events
+            validators = await load_batch_validators(db, validated_uuid)
+            if not validators:
+                raise HTTPException(status_code=404, detail=f"Batch with id '{validated_uuid}' not found")
+            etag, last_modified = page_validators(*validators)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(etag, last_modified)
+            query = select(*EVENT_COLUMNS).filter(SQLAlchemyEvent.batch_id == validated_uuid, *conditions)
+        else:
+            # One round-trip: the batch row LEFT JOINed to its matching events. No rows means
+            # no batch; a batch without matching events yields a single row of NULL event columns.
+            validators = None
+            query = (
+                select(*VALIDATOR_COLUMNS, *EVENT_COLUMNS)
+                .select_from(SQLAlchemyBatch)
+                .outerjoin(SQLAlchemyEvent, and_(SQLAlchemyEvent.batch_id == SQLAlchemyBatch.id, *conditions))
+                .filter(SQLAlchemyBatch.id == validated_uuid)
+            )
+
+        # Filters and order are served by the (batch_id, [event_type,] timestamp, id) indexes
+        query = query.order_by(SQLAlchemyEvent.timestamp.desc(), SQLAlchemyEvent.id.desc())
+        if limit:
+            # Fetch one extra row to learn whether another page follows
+            query = query.limit(limit + 1)
+        result = await db.execute(query)
+        rows = result.all()
+
+        if validators is None:
+            if not rows:
+                raise HTTPException(status_code=404, detail=f"Batch with id '{validated_uuid}' not found")
+            width = len(VALIDATOR_COLUMNS)
+            etag, last_modified = page_validators(*batch_validators(validated_uuid, *rows[0][:width]))
+            events = [row[width:] for row in rows if row[width] is not None]
+        else:
+            events = rows
+        headers = validator_headers(etag, last_modified)
+
+        if limit and len(events) > limit:
+            events = events[:limit]
+            last = event_dict(events[-1])
+            next_cursor = encode_cursor(last["timestamp"], last["id"])
+            headers["X-Next-Cursor"] = next_cursor
+            # Keep the filters of this request, only moving the cursor on
+            params = [(key, value) for key, value in request.query_params.multi_items() if key != "cursor"]
+            headers["Link"] = f'<?{urlencode(params + [("cursor", next_cursor)])}>; rel="next"'
+        # Serialize the row tuples directly; the output matches List[BatchEvent]
+        with serialization():
+            body = serialize_events(events)
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve events: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve events: {str(e)}")
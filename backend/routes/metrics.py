@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from cache import get_cache
+from db import pool_status
+from serializers import json_response
+from timing import request_metrics
+from write_queue import write_queue
+
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+@router.get("/metrics")
+async def get_metrics():
+    """Report connection pool usage, response cache and write queue counters."""
+    return json_response({"pools": pool_status(), "cache": get_cache().describe(), "write_queue": write_queue.describe()})
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Request latency, SQL and serialization timings, pool, cache and write queue counters for Prometheus."""
+    lines = []
+    for name, entry in pool_status().items():
+        for key, value in entry.items():
+            if isinstance(value, (int, float)):
+                lines.append(f'puretrace_db_pool_{key}{{engine="{name}"}} {value}')
+    cache = get_cache().describe()
+    for key, value in cache.items():
+        if isinstance(value, (int, float)):
+            lines.append(f'puretrace_cache_{key}{{backend="{cache["backend"]}"}} {value}')
+    for key, value in write_queue.describe().items():
+        if isinstance(value, (int, float)):
+            lines.append(f"puretrace_write_queue_{key} {int(value) if isinstance(value, bool) else value}")
+    body = request_metrics.render() + "\n".join(lines) + "\n"
+    return PlainTextResponse(body, media_type=PROMETHEUS_MEDIA_TYPE)
@@ -0,0 +1,78 @@
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import select
+from typing import Any, Iterable, Optional, Sequence
+from uuid import UUID
+import orjson
+
+from models.database import Batch as SQLAlchemyBatch, Event as SQLAlchemyEvent
+from timing import serialization
+
+# Columns in the field order of the Batch and BatchEvent response models
+BATCH_COLUMNS = (
+    SQLAlchemyBatch.product_name,
+    SQLAlchemyBatch.origin,
+    SQLAlchemyBatch.harvest_date,
+    SQLAlchemyBatch.id,
+    SQLAlchemyBatch.created_at,
+)
+EVENT_COLUMNS = (
+    SQLAlchemyEvent.id,
+    SQLAlchemyEvent.event_type,
+    SQLAlchemyEvent.description,
+    SQLAlchemyEvent.timestamp,
+    SQLAlchemyEvent.location,
+    SQLAlchemyEvent.batch_id,
+    SQLAlchemyEvent.created_at,
+)
+BATCH_FIELDS = ("product_name", "origin", "harvest_date", "id", "created_at")
+EVENT_FIELDS = ("id", "event_type", "description", "timestamp", "location", "batch_id", "created_at")
+
+# Same order as the Batch.events relationship
+EVENT_ORDER = (SQLAlchemyEvent.timestamp, SQLAlchemyEvent.id)
+
+# UTC datetimes as "Z" and compact separators, matching Pydantic's JSON output
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+def batch_with_events_query(batch_id: UUID):
+    """One round-trip for a batch and its events as flat row tuples (batch columns, then event columns)."""
+    return (
+        select(*BATCH_COLUMNS, *EVENT_COLUMNS)
+        .outerjoin(SQLAlchemyEvent, SQLAlchemyEvent.batch_id == SQLAlchemyBatch.id)
+        .filter(SQLAlchemyBatch.id == batch_id)
+        .order_by(*EVENT_ORDER)
+    )
+
+def event_dict(row: Sequence) -> dict:
+    return dict(zip(EVENT_FIELDS, row))
+
+def serialize_batch(rows: Sequence[Sequence]) -> Optional[bytes]:
+    """Serialize rows from batch_with_events_query to the Batch response body, or None if there are no rows."""
+    if not rows:
+        return None
+    width = len(BATCH_FIELDS)
+    batch = dict(zip(BATCH_FIELDS, rows[0][:width]))
+    # An outer join yields one all-NULL event row for a batch without events
+    batch["events"] = [event_dict(row[width:]) for row in rows if row[width] is not None]
+    return orjson.dumps(batch, option=ORJSON_OPTIONS)
+
+def serialize_event(row: Sequence) -> bytes:
+    """Serialize one EVENT_COLUMNS row tuple to a BatchEvent response body."""
+    return orjson.dumps(event_dict(row), option=ORJSON_OPTIONS)
+
+def serialize_events(rows: Iterable[Sequence]) -> bytes:
+    """Serialize EVENT_COLUMNS row tuples to a List[BatchEvent] response body."""
+    return orjson.dumps([event_dict(row) for row in rows], option=ORJSON_OPTIONS)
+
+def json_response(content: Any) -> Response:
+    """JSON response for a response model (or plain JSON data), serialized inside serialization().
+
+    Routes return this rather than the model itself, so the encoding FastAPI
+    would otherwise do after the route returns is counted in Server-Timing.
+    """
+    with serialization():
+        if isinstance(content, BaseModel):
+            body = content.model_dump_json()
+        else:
+            body = orjson.dumps(content, option=ORJSON_OPTIONS)
+    return Response(content=body, media_type="application/json")
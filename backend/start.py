@@ -1,7 +1,17 @@
 #!/usr/bin/env python3
 """
 Startup script for PureTrace backend API
+
+Development (default): single process with auto-reload.
+Production (--production or SERVER_MODE=production): several worker
+processes, no reload, uvloop/httptools when installed, graceful shutdown.
+
+    python start.py
+    python start.py --production --workers 4
 """
+import argparse
+import importlib.util
+import logging
 import os
 import uvicorn
 from dotenv import load_dotenv
@@ -14,27 +24,95 @@ def setup_environment():
     if not os.getenv("DATABASE_URL"):
         os.environ["DATABASE_URL"] = "sqlite:///./puretrace.db"
         print("Using default SQLite database: ./puretrace.db")
-    
+
     if not os.getenv("FRONTEND_BASE_URL"):
         os.environ["FRONTEND_BASE_URL"] = "http://localhost:5173"
         print("Using default frontend URL: http://localhost:5173")
 
+def available_cpus() -> int:
+    """CPUs this process may run on (respects container CPU affinity)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def worker_count() -> int:
+    """Workers from WEB_CONCURRENCY, else one per available CPU."""
+    return int(os.getenv("WEB_CONCURRENCY") or available_cpus())
+
+def apply_migrations():
+    """Bring the schema up to date once, before the server (and any worker) starts."""
+    from db import engine
+    from migrations import upgrade
+    upgrade(engine)
+    engine.dispose()
+
+def has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Start the PureTrace API server")
+    parser.add_argument(
+        "--production", action="store_true",
+        default=os.getenv("SERVER_MODE", "development").lower() == "production",
+        help="Run multiple workers without reload (default: SERVER_MODE=production)",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes in production mode (default: WEB_CONCURRENCY or CPU count)")
+    parser.add_argument(
+        "--skip-migrations", action="store_true",
+        default=os.getenv("MIGRATE_ON_START", "true").lower() not in ("1", "true", "yes"),
+        help="Don't apply pending migrations before starting (default: MIGRATE_ON_START=true; set false to skip)",
+    )
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    return parser.parse_args()
+
 def main():
     """Main startup function."""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     setup_environment()
-    
+
     print("Starting PureTrace API server...")
     print(f"Database: {os.getenv('DATABASE_URL')}")
     print(f"Frontend: {os.getenv('FRONTEND_BASE_URL')}")
-    
-    # Run the FastAPI server
+
+    if not args.skip_migrations:
+        apply_migrations()
+
+    if not args.production:
+        # Run the FastAPI server
+        uvicorn.run(
+            "main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info"
+        )
+        return
+
+    workers = args.workers or worker_count()
+    loop = "uvloop" if has_module("uvloop") else "asyncio"
+    http = "httptools" if has_module("httptools") else "h11"
+    print(f"Production mode: {workers} workers, loop={loop}, http={http}")
+
+    # The app is passed as an import string and workers are spawned, not forked,
+    # so each worker imports main and opens its own connection pools.
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        reload=False,
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT", "5")),
+        # Let in-flight requests finish before a worker exits on SIGTERM
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30")),
+        access_log=os.getenv("ACCESS_LOG", "false").lower() in ("1", "true", "yes"),
         log_level="info"
     )
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
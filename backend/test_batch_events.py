@@ -0,0 +1,94 @@
+"""
+Round-trips made by GET /batch/{batch_id}/events, counted from the
+Server-Timing header added by TimingMiddleware.
+
+Runs in-process against a throwaway SQLite database:
+    python -m pytest -q test_batch_events.py
+"""
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Always a throwaway database, even when DATABASE_URL is exported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test_batch_events.db"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from db import engine
+from main import app
+from migrations import upgrade
+
+upgrade(engine)
+client = TestClient(app)
+
+def statements(response) -> int:
+    return int(re.search(r'desc="(\d+) statements"', response.headers["server-timing"]).group(1))
+
+@pytest.fixture(scope="module")
+def batch_id():
+    response = client.post("/batch", json={"product_name": "Apples", "origin": "Orchard", "harvest_date": "2024-01-01"})
+    batch_id = response.json()["batch_id"]
+    for i in range(5):
+        client.post("/event", json={
+            "batch_id": batch_id,
+            "event_type": "Shipping" if i % 2 else "Processing",
+            "description": f"Step {i}",
+            "timestamp": f"2024-01-0{i + 1}",
+            "location": "Warehouse",
+        })
+    return batch_id
+
+def test_events_in_one_statement(batch_id):
+    response = client.get(f"/batch/{batch_id}/events")
+    assert response.status_code == 200
+    assert statements(response) == 1
+    assert [event["description"] for event in response.json()] == [f"Step {i}" for i in reversed(range(5))]
+
+def test_filtered_page_in_one_statement(batch_id):
+    response = client.get(f"/batch/{batch_id}/events", params={"event_type": "Processing", "limit": 2})
+    assert statements(response) == 1
+    assert [event["description"] for event in response.json()] == ["Step 4", "Step 2"]
+    next_page = client.get(f"/batch/{batch_id}/events", params={"event_type": "Processing", "limit": 2, "cursor": response.headers["x-next-cursor"]})
+    assert statements(next_page) == 1
+    assert [event["description"] for event in next_page.json()] == ["Step 0"]
+    assert "x-next-cursor" not in next_page.headers
+
+def test_next_link_keeps_filters(batch_id):
+    response = client.get(f"/batch/{batch_id}/events", params={"event_type": "Processing", "limit": 1, "since": "2024-01-02"})
+    link = re.match(r'<(\?[^>]*)>; rel="next"', response.headers["link"]).group(1)
+    next_page = client.get(f"/batch/{batch_id}/events{link}")
+    assert [event["description"] for event in next_page.json()] == ["Step 2"]
+    assert "link" not in next_page.headers
+
+def test_created_filters_honour_utc_offsets(batch_id):
+    hour_ago = (datetime.now(timezone(timedelta(hours=5))) - timedelta(hours=1)).isoformat()
+    response = client.get(f"/batch/{batch_id}/events", params={"created_since": hour_ago})
+    assert len(response.json()) == 5
+    response = client.get(f"/batch/{batch_id}/events", params={"created_until": hour_ago})
+    assert response.json() == []
+
+def test_no_matching_events_is_empty_not_404(batch_id):
+    response = client.get(f"/batch/{batch_id}/events", params={"event_type": "Recall"})
+    assert response.status_code == 200
+    assert response.json() == []
+    assert statements(response) == 1
+
+def test_missing_batch_is_404_in_one_statement():
+    response = client.get("/batch/00000000-0000-7000-8000-000000000000/events")
+    assert response.status_code == 404
+    assert statements(response) == 1
+
+def test_conditional_requests(batch_id):
+    first = client.get(f"/batch/{batch_id}/events")
+    # A matching validator is answered from the batch row alone
+    not_modified = client.get(f"/batch/{batch_id}/events", headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert statements(not_modified) == 1
+    # A stale one costs the validator read plus the events query
+    stale = client.get(f"/batch/{batch_id}/events", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert statements(stale) == 2
+    assert stale.headers["etag"] == first.headers["etag"]
+    assert stale.content == first.content
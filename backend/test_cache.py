@@ -0,0 +1,179 @@
+"""
+Response cache: LRU expiry and eviction, invalidation by the write routes,
+ETag-checked entries, and the Redis backend (against a dict-backed
+stand-in client).
+
+    python -m pytest -q test_cache.py
+"""
+import os
+import tempfile
+
+# Always a throwaway database, even when DATABASE_URL is exported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test_cache.db"
+
+import asyncio
+from contextlib import contextmanager
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+
+import cache
+from cache import LRUCache, RedisCache, batch_cache_key, get_cache, set_cache
+from db import engine
+from main import app
+from migrations import upgrade
+
+upgrade(engine)
+client = TestClient(app)
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class DictRedis:
+    """Stand-in for redis.asyncio.Redis: get/set/delete on a dict, recording each expiry."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+@pytest.fixture
+def active_cache():
+    """Install a fresh in-memory cache for one test, restoring the previous one afterwards."""
+    previous = get_cache()
+    backend = LRUCache(max_entries=100, ttl=60)
+    set_cache(backend)
+    yield backend
+    set_cache(previous)
+
+@contextmanager
+def cache_bypassed():
+    """Run writes against a separate cache, so the active one is not invalidated."""
+    previous = get_cache()
+    set_cache(LRUCache())
+    try:
+        yield
+    finally:
+        set_cache(previous)
+
+def create_batch() -> str:
+    response = client.post("/batch", json={"product_name": "Pears", "origin": "Orchard", "harvest_date": "2024-01-01"})
+    return response.json()["batch_id"]
+
+def add_event(batch_id: str, day: int = 1):
+    client.post("/event", json={
+        "batch_id": batch_id,
+        "event_type": "Processing",
+        "description": f"Day {day}",
+        "timestamp": f"2024-01-0{day}",
+        "location": "Warehouse",
+    })
+
+def test_lru_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    lru = LRUCache(max_entries=10, ttl=5)
+    run(lru.set("a", b"1"))
+    clock.now += 4.9
+    assert run(lru.get("a")) == b"1"
+    clock.now += 0.1
+    assert run(lru.get("a")) is None
+    assert lru.stats.expirations == 1
+    assert lru.describe()["entries"] == 0
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(max_entries=2, ttl=60)
+    run(lru.set("a", b"1"))
+    run(lru.set("b", b"2"))
+    # Reading "a" makes "b" the least recently used
+    assert run(lru.get("a")) == b"1"
+    run(lru.set("c", b"3"))
+    assert run(lru.get("b")) is None
+    assert run(lru.get("a")) == b"1"
+    assert run(lru.get("c")) == b"3"
+    assert lru.stats.evictions == 1
+
+def test_post_event_invalidates_cached_batch(active_cache):
+    batch_id = create_batch()
+    key = batch_cache_key(UUID(batch_id))
+    first = client.get(f"/batch/{batch_id}")
+    assert run(active_cache.get(key)) is not None
+
+    add_event(batch_id)
+    assert active_cache.stats.invalidations == 1
+    assert run(active_cache.get(key)) is None
+    second = client.get(f"/batch/{batch_id}")
+    assert len(second.json()["events"]) == len(first.json()["events"]) + 1
+
+def test_bulk_events_invalidate_cached_batches(active_cache):
+    batch_ids = [create_batch(), create_batch()]
+    for batch_id in batch_ids:
+        client.get(f"/batch/{batch_id}")
+        assert run(active_cache.get(batch_cache_key(UUID(batch_id)))) is not None
+
+    response = client.post("/events/bulk", json=[
+        {"batch_id": batch_id, "event_type": "Shipping", "description": "Bulk", "timestamp": "2024-01-02", "location": "Dock"}
+        for batch_id in batch_ids
+    ])
+    assert response.json()["created"] == 2
+    for batch_id in batch_ids:
+        assert run(active_cache.get(batch_cache_key(UUID(batch_id)))) is None
+        assert len(client.get(f"/batch/{batch_id}").json()["events"]) == 1
+
+def test_entry_under_outdated_etag_is_a_miss(active_cache):
+    batch_id = create_batch()
+    client.get(f"/batch/{batch_id}")
+    # Written behind this cache's back, as by another worker
+    with cache_bypassed():
+        add_event(batch_id)
+    response = client.get(f"/batch/{batch_id}")
+    assert len(response.json()["events"]) == 1
+    assert active_cache.stats.stale == 1
+
+def test_store_after_invalidation_is_never_served(active_cache):
+    batch_id = create_batch()
+    stale_etag = client.get(f"/batch/{batch_id}").headers["etag"]
+    add_event(batch_id)
+    # A slow reader of the old state stores it after the writer invalidated
+    key = batch_cache_key(UUID(batch_id))
+    run(cache.set_validated(active_cache, key, stale_etag, b"{}"))
+    response = client.get(f"/batch/{batch_id}")
+    assert len(response.json()["events"]) == 1
+    assert active_cache.stats.stale == 1
+
+def test_redis_backend_through_set_cache():
+    redis = DictRedis()
+    previous = get_cache()
+    set_cache(RedisCache(redis, ttl=30))
+    try:
+        batch_id = create_batch()
+        key = "puretrace:" + batch_cache_key(UUID(batch_id))
+        first = client.get(f"/batch/{batch_id}")
+        assert key in redis.data
+        assert redis.expiry[key] == 30
+        again = client.get(f"/batch/{batch_id}")
+        assert again.content == first.content
+        assert get_cache().stats.hits == 1
+
+        add_event(batch_id)
+        assert key not in redis.data
+        assert len(client.get(f"/batch/{batch_id}").json()["events"]) == 1
+    finally:
+        set_cache(previous)
@@ -0,0 +1,66 @@
+"""
+Incremental NDJSON parsing for the bulk endpoints: records are the same
+however the body is split, and an oversized line fails as its own record.
+
+    python -m pytest -q test_ingest.py
+"""
+import os
+import tempfile
+
+# Always a throwaway database, even when DATABASE_URL is exported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test_ingest.db"
+
+import asyncio
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from db import engine
+from ingest import NDJSON_MAX_LINE_BYTES, LineTooLong, iter_ndjson_chunks
+from main import app
+from migrations import upgrade
+
+upgrade(engine)
+
+BODY = b'{"a": 1}\n\n{"b": 2}\n' + b"x" * 30 + b'\n[1]\r\n{"c": 3}'
+
+class StreamedRequest:
+    def __init__(self, parts):
+        self.parts = parts
+
+    async def stream(self):
+        for part in self.parts:
+            yield part
+
+def parse(parts, **kwargs):
+    async def collect():
+        return [chunk async for chunk in iter_ndjson_chunks(StreamedRequest(parts), **kwargs)]
+    return asyncio.run(collect())
+
+@pytest.mark.parametrize("split", [1, 3, 7, len(BODY)])
+def test_records_do_not_depend_on_how_the_body_is_split(split):
+    parts = [BODY[i:i + split] for i in range(0, len(BODY), split)]
+    chunks = parse(parts, size=2, max_line=20)
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    records = [record for chunk in chunks for record in chunk]
+    assert records[:2] == [{"a": 1}, {"b": 2}]
+    assert isinstance(records[2], LineTooLong)
+    assert records[3:] == [[1], {"c": 3}]
+
+def test_oversized_line_is_not_buffered():
+    records = parse([b"x" * 15, b"y" * 15, b"z" * 15, b"\n{}"], max_line=20)[0]
+    assert isinstance(records[0], LineTooLong)
+    assert records[1] == {}
+
+def test_oversized_line_fails_only_its_record():
+    response = TestClient(app).post("/batches/bulk", headers={"Content-Type": "application/x-ndjson"}, content=b"\n".join([
+        orjson.dumps({"product_name": "Pears", "origin": "Orchard", "harvest_date": "2024-01-01", "padding": "p" * NDJSON_MAX_LINE_BYTES}),
+        orjson.dumps({"product_name": "Plums", "origin": "Orchard", "harvest_date": "2024-01-01"}),
+    ]))
+    assert response.status_code == 200
+    results = [orjson.loads(line) for line in response.content.splitlines()]
+    assert results[0]["errors"][0]["type"] == "line_too_long"
+    assert results[1]["errors"] is None
+    assert response.headers["x-created-count"] == "1"
+    assert response.headers["x-failed-count"] == "1"
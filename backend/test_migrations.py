@@ -0,0 +1,87 @@
+"""
+Versioned migrations: a fresh database reaches the latest revision, databases
+created before versioning are brought up to date, and the API refuses to
+start on an unmigrated database.
+
+    python -m pytest -q test_migrations.py
+"""
+import os
+import tempfile
+
+# Always a throwaway database, even when DATABASE_URL is exported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test_migrations.db"
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from migrations import SchemaVersionError, check_schema, current_revision, head, load_revisions, upgrade
+
+def fresh_engine(name: str):
+    return create_engine(f"sqlite:///{tempfile.mkdtemp()}/{name}.db")
+
+def test_revisions_form_a_chain():
+    revisions = load_revisions()
+    assert revisions[0].down_revision is None
+    for previous, module in zip(revisions, revisions[1:]):
+        assert module.down_revision == previous.revision
+
+def test_upgrade_fresh_database():
+    engine = fresh_engine("fresh")
+    with engine.connect() as conn:
+        with pytest.raises(SchemaVersionError):
+            check_schema(conn)
+    assert upgrade(engine) == [module.revision for module in load_revisions()]
+    assert upgrade(engine) == []
+    with engine.connect() as conn:
+        assert current_revision(conn) == head()
+        check_schema(conn)
+
+def test_upgrade_stepwise():
+    engine = fresh_engine("stepwise")
+    assert upgrade(engine, "0001") == ["0001"]
+    with engine.connect() as conn:
+        assert current_revision(conn) == "0001"
+        with pytest.raises(SchemaVersionError):
+            check_schema(conn)
+    assert upgrade(engine)[0] == "0002"
+
+def test_upgrade_unversioned_database():
+    # Schema as created before batches.version, string keys and composite indexes
+    engine = fresh_engine("legacy")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE batches (id VARCHAR PRIMARY KEY, product_name VARCHAR NOT NULL, origin VARCHAR NOT NULL, "
+            "harvest_date DATE NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE events (id VARCHAR PRIMARY KEY, batch_id VARCHAR REFERENCES batches(id), "
+            "event_type VARCHAR NOT NULL, description VARCHAR NOT NULL, timestamp DATE NOT NULL, "
+            "location VARCHAR NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.exec_driver_sql("CREATE INDEX idx_events_batch_id ON events (batch_id)")
+        conn.exec_driver_sql(
+            "INSERT INTO batches (id, product_name, origin, harvest_date) "
+            "VALUES ('0190f2c4-5a3b-7c00-8000-000000000001', 'Apples', 'Orchard', '2024-01-01')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO events (id, batch_id, event_type, description, timestamp, location) "
+            "VALUES ('0190f2c4-5a3b-7c00-8000-000000000002', '0190f2c4-5a3b-7c00-8000-000000000001', "
+            "'Shipping', 'Shipped', '2024-01-02', 'Port'), "
+            "('0190f2c4-5a3b-7c00-8000-000000000003', '0190f2c4-5a3b-7c00-8000-000000000001', "
+            "'Storage', 'Stored', '2024-01-03', 'Depot')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO batches (id, product_name, origin, harvest_date) "
+            "VALUES ('0190f2c4-5a3b-7c00-8000-000000000004', 'Pears', 'Orchard', '2024-01-01')"
+        )
+    upgrade(engine)
+    with engine.connect() as conn:
+        assert current_revision(conn) == head()
+        assert "ix_batches_created_at_id" in {index["name"] for index in inspect(conn).get_indexes("batches")}
+        event_indexes = {index["name"] for index in inspect(conn).get_indexes("events")}
+        assert "ix_events_batch_id_timestamp_id" in event_indexes
+        assert not event_indexes & {"ix_events_batch_id", "idx_events_batch_id"}
+        rows = conn.execute(text(
+            "SELECT version, last_event_at IS NOT NULL, typeof(id), length(created_at) FROM batches ORDER BY id"
+        )).all()
+        assert rows == [(2, 1, "blob", 26), (0, 0, "blob", 26)]
@@ -0,0 +1,86 @@
+"""
+Byte-for-byte parity between the orjson read path in serializers.py and the
+Pydantic response models it replaces.
+
+Runs in-process against a throwaway SQLite database:
+    python -m pytest -q test_serialization.py
+"""
+import os
+import tempfile
+from datetime import date, datetime, timezone
+
+# Always a throwaway database, even when DATABASE_URL is exported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test_serialization.db"
+
+import pytest
+from sqlalchemy import select
+
+from db import SessionLocal, engine
+from migrations import upgrade
+from models.batch import Batch as PydanticBatch, BatchEventList
+from models.database import Batch as SQLAlchemyBatch, Event as SQLAlchemyEvent
+from serializers import EVENT_COLUMNS, EVENT_ORDER, batch_with_events_query, serialize_batch, serialize_events
+
+# Strings that exercise escaping and non-ASCII output
+AWKWARD_TEXT = [
+    "plain",
+    "Café Olé – ½ kg",
+    'quotes " and \\ backslashes',
+    "line\nbreak\ttab\x01control",
+    "emoji 🍅 and 漢字",
+    "",
+]
+
+@pytest.fixture(scope="module")
+def db():
+    upgrade(engine)
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+
+def add_batch(db, name: str, events: int) -> SQLAlchemyBatch:
+    batch = SQLAlchemyBatch(
+        product_name=name,
+        origin=AWKWARD_TEXT[events % len(AWKWARD_TEXT)],
+        harvest_date=date(2024, 2, 29),
+        created_at=datetime(2024, 3, 1, 8, 30, 0, 0, tzinfo=timezone.utc),
+    )
+    db.add(batch)
+    db.flush()
+    for i in range(events):
+        db.add(SQLAlchemyEvent(
+            batch_id=batch.id,
+            event_type=AWKWARD_TEXT[i % len(AWKWARD_TEXT)] or "Processing",
+            description=AWKWARD_TEXT[(i + 1) % len(AWKWARD_TEXT)],
+            # Repeated timestamps check the id tie-break in the ordering
+            timestamp=date(2024, 3, 1 + i // 2),
+            location=AWKWARD_TEXT[(i + 2) % len(AWKWARD_TEXT)],
+            # Alternate whole seconds and microsecond precision
+            created_at=datetime(2024, 3, 1, 9, 0, i, 123456 * (i % 2), tzinfo=timezone.utc),
+        ))
+    db.commit()
+    db.expire_all()
+    return batch
+
+@pytest.mark.parametrize("events", [0, 1, 7])
+def test_batch_parity(db, events):
+    batch = add_batch(db, f"Batch {events} ✓", events)
+    expected = PydanticBatch.model_validate(batch).model_dump_json().encode()
+    assert serialize_batch(db.execute(batch_with_events_query(batch.id)).all()) == expected
+
+def test_missing_batch(db):
+    batch = add_batch(db, "Deleted", 0)
+    db.delete(batch)
+    db.commit()
+    assert serialize_batch(db.execute(batch_with_events_query(batch.id)).all()) is None
+
+def test_event_list_parity(db):
+    batch = add_batch(db, "Events", 12)
+    query = lambda *columns: (
+        select(*columns).filter(SQLAlchemyEvent.batch_id == batch.id).order_by(*EVENT_ORDER)
+    )
+    orm_events = db.execute(query(SQLAlchemyEvent)).scalars().all()
+    expected = BatchEventList.dump_json(BatchEventList.validate_python(orm_events, from_attributes=True))
+    assert serialize_events(db.execute(query(*EVENT_COLUMNS)).all()) == expected
+    assert serialize_events([]) == BatchEventList.dump_json([])
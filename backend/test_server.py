@@ -7,6 +7,11 @@ import traceback
 os.environ['DATABASE_URL'] = 'sqlite:///./puretrace.db'
 
 try:
+    print("Applying migrations...")
+    from db import engine
+    from migrations import upgrade
+    upgrade(engine)
+
     print("Importing main app...")
     from main import app
     print("App imported successfully")
@@ -0,0 +1,55 @@
+"""
+Single-writer queue: concurrent POST /event and POST /batch requests are
+committed in groups, and a failing write only fails its own request.
+
+    python -m pytest -q test_write_queue.py
+"""
+import os
+import tempfile
+
+# Always a throwaway database, even when DATABASE_URL is exported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test_write_queue.db"
+
+import asyncio
+
+import httpx
+
+from db import engine
+from main import app
+from migrations import upgrade
+from write_queue import write_queue
+
+upgrade(engine)
+
+BATCH = {"product_name": "Pears", "origin": "Orchard", "harvest_date": "2024-01-01"}
+
+def event(batch_id: str, i: int) -> dict:
+    return {"batch_id": batch_id, "event_type": "Shipping", "description": f"Leg {i}", "timestamp": "2024-01-02", "location": "Port"}
+
+async def burst():
+    write_queue.start()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            batches = await asyncio.gather(*(client.post("/batch", json=BATCH) for _ in range(5)))
+            batch_id = batches[0].json()["batch_id"]
+            events = await asyncio.gather(
+                *(client.post("/event", json=event(batch_id, i)) for i in range(20)),
+                client.post("/event", json=event("00000000-0000-7000-8000-000000000000", 20)),
+            )
+            stored = await client.get(f"/batch/{batch_id}/events")
+            batch = await client.get(f"/batch/{batch_id}")
+    finally:
+        await write_queue.stop()
+    return batches, events, stored, batch
+
+def test_group_commit():
+    batches, events, stored, batch = asyncio.run(burst())
+    assert [response.status_code for response in batches] == [200] * 5
+    # The missing batch is rolled back to its savepoint; the rest of its group still commits
+    assert [response.status_code for response in events] == [200] * 20 + [404]
+    assert sorted(event["description"] for event in stored.json()) == sorted(f"Leg {i}" for i in range(20))
+    assert len(batch.json()["events"]) == 20
+    stats = write_queue.describe()
+    assert stats["writes"] == 26
+    assert stats["groups"] < stats["writes"]
+    assert not stats["enabled"]
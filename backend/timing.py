@@ -0,0 +1,176 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from typing import Dict, Optional, Tuple
+import threading
+import time
+
+# Upper bounds (seconds) of the request duration histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestTiming:
+    """Time spent by one request, filled in by the engine hooks and serialization()."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds."""
+        total = time.perf_counter() - self.start
+        return ", ".join([
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statements} statements"',
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ])
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+@contextmanager
+def attributed_to(timing: Optional[RequestTiming]):
+    """Count statements run in the enclosed block against timing, e.g. work done for a request by another task."""
+    token = _current.set(timing)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def serialization():
+    """Count the enclosed block as response serialization time for the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing = _current.get()
+        if timing is not None:
+            timing.serialize_seconds += time.perf_counter() - start
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._timing_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _current.get()
+    if timing is not None:
+        timing.statements += 1
+        timing.db_seconds += time.perf_counter() - context._timing_start
+
+def instrument_engine(engine):
+    """Attribute statements run on a (sync) engine to the request that issued them."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class RequestMetrics:
+    """Per-route request counters and latency histograms in Prometheus text format."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.routes: Dict[Tuple[str, str], dict] = {}
+
+    def record(self, method: str, route: str, status: int, timing: RequestTiming, duration: float):
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            entry = self.routes.get((method, route))
+            if entry is None:
+                entry = self.routes[(method, route)] = {
+                    "buckets": [0] * len(self.buckets),
+                    "count": 0,
+                    "duration": 0.0,
+                    "statements": 0,
+                    "db": 0.0,
+                    "serialize": 0.0,
+                }
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    entry["buckets"][i] += 1
+            entry["count"] += 1
+            entry["duration"] += duration
+            entry["statements"] += timing.statements
+            entry["db"] += timing.db_seconds
+            entry["serialize"] += timing.serialize_seconds
+
+    def render(self) -> str:
+        lines = [
+            "# HELP puretrace_http_requests_total HTTP requests by method, route and status.",
+            "# TYPE puretrace_http_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'puretrace_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+            lines += [
+                "# HELP puretrace_http_request_duration_seconds Request latency until the response completes.",
+                "# TYPE puretrace_http_request_duration_seconds histogram",
+            ]
+            for (method, route), entry in sorted(self.routes.items()):
+                labels = f'method="{method}",route="{route}"'
+                for bound, count in zip(self.buckets, entry["buckets"]):
+                    lines.append(f'puretrace_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'puretrace_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+                lines.append(f'puretrace_http_request_duration_seconds_sum{{{labels}}} {entry["duration"]:.6f}')
+                lines.append(f'puretrace_http_request_duration_seconds_count{{{labels}}} {entry["count"]}')
+            for name, key, kind, help_text in (
+                ("puretrace_db_statements_total", "statements", "counter", "SQL statements executed while serving requests."),
+                ("puretrace_db_duration_seconds_total", "db", "counter", "Time spent executing SQL while serving requests."),
+                ("puretrace_serialization_duration_seconds_total", "serialize", "counter", "Time spent serializing response bodies."),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for (method, route), entry in sorted(self.routes.items()):
+                    value = entry[key] if key == "statements" else f"{entry[key]:.6f}"
+                    lines.append(f'{name}{{method="{method}",route="{route}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+request_metrics = RequestMetrics()
+
+# Endpoint function -> route path template, so labels stay low-cardinality
+_route_paths: Dict[object, str] = {}
+
+def route_label(scope) -> str:
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    label = _route_paths.get(endpoint)
+    if label is None:
+        label = next(
+            (route.path for route in scope["app"].routes if getattr(route, "endpoint", None) is endpoint),
+            "unmatched",
+        )
+        _route_paths[endpoint] = label
+    return label
+
+class TimingMiddleware:
+    """Pure ASGI middleware that times each HTTP request and adds a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = RequestTiming()
+        token = _current.set(timing)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            request_metrics.record(scope["method"], route_label(scope), status, timing, time.perf_counter() - timing.start)
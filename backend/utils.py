@@ -1,6 +1,10 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Callable, Optional, Tuple, Union
 from uuid import UUID
+import base64
+import json
+import os
+import time
 
 def validate_date(date_str: str) -> Optional[date]:
     """Validate and parse date string into date object."""
@@ -16,6 +20,39 @@ def validate_uuid(uuid_str: str) -> Optional[UUID]:
     except ValueError:
         return None
 
+def uuid7(timestamp_ms: Optional[int] = None, rand: Optional[int] = None) -> UUID:
+    """Generate a time-ordered UUIDv7 (48-bit millisecond timestamp followed by random bits).
+
+    Both parts default to the current time and os.urandom; pass them to build
+    reproducible IDs (rand supplies the low 74 bits).
+    """
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    if rand is None:
+        rand = int.from_bytes(os.urandom(10), "big")
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 62) & 0xFFF) << 64  # rand_a
+    value |= 0b10 << 62  # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b
+    return UUID(int=value)
+
+def encode_cursor(position: Union[date, datetime], row_id: UUID) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    payload = json.dumps([position.isoformat(), row_id.hex], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(
+    cursor: str, parse: Callable[[str], Union[date, datetime]] = datetime.fromisoformat
+) -> Optional[Tuple[Union[date, datetime], UUID]]:
+    """Decode a cursor produced by encode_cursor, or return None if it is malformed."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position, row_id = json.loads(payload)
+        return parse(position), UUID(hex=row_id)
+    except (ValueError, TypeError):
+        return None
+
 def format_batch_response(batch: dict) -> dict:
     """Format batch data for API response."""
     return {
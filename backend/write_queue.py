@@ -0,0 +1,139 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import AsyncSessionLocal
+from timing import attributed_to, current_timing
+
+# Single-writer queue: serialize this worker's single-row writes through one task (off by default)
+WRITE_QUEUE = os.getenv("WRITE_QUEUE", "false").lower() in ("1", "true", "yes")
+WRITE_QUEUE_SIZE = int(os.getenv("WRITE_QUEUE_SIZE", "1000"))
+WRITE_QUEUE_MAX_GROUP = int(os.getenv("WRITE_QUEUE_MAX_GROUP", "100"))
+WRITE_QUEUE_TIMEOUT = float(os.getenv("WRITE_QUEUE_TIMEOUT", "5"))
+
+logger = logging.getLogger("puretrace.write_queue")
+
+Write = Callable[[AsyncSession], Awaitable[Any]]
+
+class WriteQueue:
+    """Bounded queue of writes applied by one task, several per transaction (group commit).
+
+    Each write is an async function run against the writer's session inside
+    its own SAVEPOINT, so one failing write (a missing batch, say) is rolled
+    back without affecting the others in its group. The group is committed
+    once, then every submitter is resumed with its write's result or error.
+    Reads don't go through the queue and stay concurrent.
+    """
+
+    def __init__(self, session_factory, size: int = WRITE_QUEUE_SIZE, max_group: int = WRITE_QUEUE_MAX_GROUP, timeout: float = WRITE_QUEUE_TIMEOUT):
+        self.session_factory = session_factory
+        self.size = size
+        self.max_group = max_group
+        self.timeout = timeout
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.groups = 0
+        self.writes = 0
+        self.failed_groups = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None
+
+    def start(self):
+        """Start the writer task on the running event loop."""
+        self.queue = asyncio.Queue(maxsize=self.size)
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Apply the writes already queued, then stop the writer task."""
+        if self.task is None:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+
+    async def submit(self, write: Write) -> Any:
+        """Queue a write and wait until its group has committed; 503 if the queue stays full."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self.queue.put((write, future, current_timing())), self.timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Write queue is full, retry later")
+        return await future
+
+    async def _run(self):
+        while True:
+            # Take whatever has queued up, up to max_group, stopping at the None put by stop()
+            item = await self.queue.get()
+            group = []
+            while item is not None:
+                group.append(item)
+                if len(group) >= self.max_group or self.queue.empty():
+                    break
+                item = self.queue.get_nowait()
+            if group:
+                await self._apply(group)
+            if item is None:
+                return
+
+    async def _apply(self, group: List[Tuple[Write, asyncio.Future, Any]]):
+        outcomes = []
+        try:
+            async with self.session_factory() as session:
+                connection = await session.connection()
+                if connection.dialect.name == "sqlite":
+                    # The sqlite3 driver only opens a transaction before DML, so the first SAVEPOINT
+                    # would open it and its RELEASE commit it; begin explicitly, taking the write lock now
+                    await connection.exec_driver_sql("BEGIN IMMEDIATE")
+                for write, future, timing in group:
+                    with attributed_to(timing):
+                        try:
+                            async with session.begin_nested():
+                                outcomes.append((future, await write(session), None))
+                        except Exception as e:
+                            outcomes.append((future, None, e))
+                await session.commit()
+        except Exception as e:
+            # The commit itself failed, so none of the group was written
+            logger.exception("Write queue group of %d failed", len(group))
+            self.failed_groups += 1
+            outcomes = [(future, None, e) for _, future, _ in group]
+        self.groups += 1
+        self.writes += len(group)
+        for future, result, error in outcomes:
+            if future.cancelled():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.running,
+            "depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_size": self.size,
+            "max_group": self.max_group,
+            "groups": self.groups,
+            "writes": self.writes,
+            "avg_group_size": round(self.writes / self.groups, 2) if self.groups else 0.0,
+            "failed_groups": self.failed_groups,
+            "rejected": self.rejected,
+        }
+
+async def apply_write(db: AsyncSession, write: Write) -> Any:
+    """Run a write through the queue when it is running, else on the request's session and commit."""
+    if write_queue.running:
+        return await write_queue.submit(write)
+    result = await write(db)
+    await db.commit()
+    return result
+
+write_queue = WriteQueue(AsyncSessionLocal)
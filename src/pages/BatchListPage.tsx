@@ -8,22 +8,51 @@ interface BatchSummary {
   origin: string;
   harvest_date: string;
   created_at: string;
-  events: any[];
+  event_count: number;
 }
 
+interface BatchPage {
+  items: BatchSummary[];
+  next_cursor: string | null;
+}
+
+const PAGE_SIZE = 24;
+
 const BatchListPage: React.FC = () => {
   const [batches, setBatches] = useState<BatchSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState<boolean>(true);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const [error, setError] = useState<string>('');
 
-  // Note: This would require a backend endpoint to list all batches
-  // For now, we'll show a placeholder since we don't have a list endpoint
+  const fetchBatches = async (cursor: string | null = null) => {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    try {
+      const response = await fetch(`http://127.0.0.1:8000/batches?${params.toString()}`);
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      const page: BatchPage = await response.json();
+      setBatches((previous) => (cursor ? [...previous, ...page.items] : page.items));
+      setNextCursor(page.next_cursor);
+    } catch (err: any) {
+      setError(err.message || 'Failed to load batches');
+    }
+  };
+
   useEffect(() => {
-    // TODO: Implement when backend has a list batches endpoint
-    // fetchBatches();
-    setLoading(false);
+    fetchBatches().finally(() => setLoading(false));
   }, []);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    await fetchBatches(nextCursor);
+    setLoadingMore(false);
+  };
+
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString('en-US', {
       year: 'numeric',
@@ -56,46 +85,48 @@ const BatchListPage: React.FC = () => {
         </div>
       )}
 
-      {/* Placeholder content */}
-      <div className="bg-gray-50 rounded-lg p-8 text-center">
-        <div className="text-6xl mb-4">📦</div>
-        <h2 className="text-xl font-semibold text-gray-700 mb-2">
-          Batch List Coming Soon
-        </h2>
-        <p className="text-gray-600 mb-6">
-          This feature requires a backend endpoint to list all batches. For now, you can:
-        </p>
-        <div className="space-y-2 text-left max-w-md mx-auto">
-          <div className="flex items-center space-x-2">
-            <span className="text-green-600">✓</span>
-            <span>Create new batches</span>
-          </div>
-          <div className="flex items-center space-x-2">
-            <span className="text-green-600">✓</span>
-            <span>Add events to existing batches</span>
+      {/* Empty state */}
+      {batches.length === 0 && !error && (
+        <div className="bg-gray-50 rounded-lg p-8 text-center">
+          <div className="text-6xl mb-4">📦</div>
+          <h2 className="text-xl font-semibold text-gray-700 mb-2">
+            No Batches Yet
+          </h2>
+          <p className="text-gray-600 mb-6">
+            Batches you create will be listed here. To get started, you can:
+          </p>
+          <div className="space-y-2 text-left max-w-md mx-auto">
+            <div className="flex items-center space-x-2">
+              <span className="text-green-600">✓</span>
+              <span>Create new batches</span>
+            </div>
+            <div className="flex items-center space-x-2">
+              <span className="text-green-600">✓</span>
+              <span>Add events to existing batches</span>
+            </div>
+            <div className="flex items-center space-x-2">
+              <span className="text-green-600">✓</span>
+              <span>View batch traces using QR codes or direct URLs</span>
+            </div>
           </div>
-          <div className="flex items-center space-x-2">
-            <span className="text-green-600">✓</span>
-            <span>View batch traces using QR codes or direct URLs</span>
+          <div className="mt-6 space-x-4">
+            <Link
+              to="/"
+              className="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md text-white bg-green-600 hover:bg-green-700"
+            >
+              Create New Batch
+            </Link>
+            <Link
+              to="/add-event"
+              className="inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50"
+            >
+              Add Event
+            </Link>
           </div>
         </div>
-        <div className="mt-6 space-x-4">
-          <Link
-            to="/"
-            className="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md text-white bg-green-600 hover:bg-green-700"
-          >
-            Create New Batch
-          </Link>
-          <Link
-            to="/add-event"
-            className="inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50"
-          >
-            Add Event
-          </Link>
-        </div>
-      </div>
+      )}
 
-      {/* Example of what the batch list would look like */}
+      {/* Batch list */}
       {batches.length > 0 && (
         <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3">
           {batches.map((batch) => (
@@ -117,7 +148,7 @@ const BatchListPage: React.FC = () => {
                   <strong>Harvest:</strong> {formatDate(batch.harvest_date)}
                 </p>
                 <p className="text-sm text-gray-600">
-                  <strong>Events:</strong> {batch.events?.length || 0}
+                  <strong>Events:</strong> {batch.event_count}
                 </p>
               </div>
 
@@ -149,6 +180,18 @@ const BatchListPage: React.FC = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="mt-8 text-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load More'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };